@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Incremental index of explicit `any` usages in the TypeScript tree.
+
+Scans src/**/*.{ts,tsx} for `any` in type positions (outside comments and
+strings) and records file, line, column, kind, the source line and the
+nearest enclosing declaration in a persistent index. On later runs a file is
+re-scanned only when its content hash changes (unchanged mtime and size skip
+even the hash), so queries over the whole frontend stay fast.
+
+    python any_index.py services/ai                  # remaining `any` under src/services/ai
+    python any_index.py --count                      # usages per file
+    python any_index.py services/ai --files \\
+        | python codemod.py --rules codemods/no_explicit_any.json --files-from -
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+
+INDEX_FILE = '.any_index.json'
+INDEX_VERSION = 1
+SCAN_ROOT = 'src'
+EXTENSIONS = ('.ts', '.tsx')
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build'}
+
+# Comments, string/template literals and `any`; literals are matched only so
+# that an `any` inside them is skipped. Template interpolations and regex
+# literals are not parsed.
+TOKEN_PATTERN = re.compile(r'''
+    //[^\n]*
+  | /\*.*?\*/
+  | '(?:\\.|[^'\\\n])*'
+  | "(?:\\.|[^"\\\n])*"
+  | `(?:\\.|[^`\\])*`
+  | \bany\b
+''', re.S | re.X)
+
+# Lines that open a declaration, reported as the usage's enclosing context
+DECLARATION_PATTERN = re.compile(
+    r'^\s*(?:export\s+)?(?:default\s+)?(?:declare\s+)?(?:abstract\s+)?(?:async\s+)?'
+    r'(?:function\b|class\b|interface\b|type\b|enum\b|(?:const|let|var)\s+\w+\s*[:=])'
+    r'|^\s*(?:(?:public|private|protected|static|readonly|async|get|set)\s+)*(?P<method>\w+)\s*(?:<[^>]*>)?\s*\((?!.*;\s*$)'
+)
+NOT_DECLARATIONS = {'if', 'for', 'while', 'switch', 'catch', 'return', 'await'}
+
+# Last code character(s) before `any` -> usage kind
+KIND_BY_PREFIX = {
+    ':': 'annotation',
+    '<': 'generic',
+    ',': 'generic',
+    '[': 'tuple',
+    '|': 'union',
+    '&': 'union',
+    '=': 'alias',
+    '=>': 'return',
+}
+
+# (line, column, kind, source line, enclosing declaration)
+Usage = Tuple[int, int, str, str, str]
+
+
+def usage_kind(content: str, start: int) -> Optional[str]:
+    """Kind of the `any` at start, from the code before it; None if not a type position"""
+    i = start - 1
+    while i >= 0 and content[i] in ' \t\r\n':
+        i -= 1
+    if i < 0:
+        return None
+    if content[i] == '>' and i > 0 and content[i - 1] == '=':
+        return KIND_BY_PREFIX['=>']
+    if content[i] in KIND_BY_PREFIX:
+        if content[i] == '=' and i > 0 and content[i - 1] in '=!<>':
+            return None  # Comparison, not a type alias
+        return KIND_BY_PREFIX[content[i]]
+    if content[i - 1:i + 1] == 'as' and (i < 2 or not (content[i - 2].isalnum() or content[i - 2] in '_$')):
+        return 'assertion'
+    return None
+
+
+def enclosing_declaration(lines: List[str], line_index: int) -> str:
+    """Nearest line at or above line_index that opens a declaration"""
+    for i in range(line_index, -1, -1):
+        match = DECLARATION_PATTERN.match(lines[i])
+        if match and match.group('method') not in NOT_DECLARATIONS:
+            return lines[i].strip()[:200]
+    return ''
+
+
+def scan(content: str) -> List[Usage]:
+    """Explicit `any` usages in one file's source"""
+    line_starts = [0]
+    position = content.find('\n')
+    while position >= 0:
+        line_starts.append(position + 1)
+        position = content.find('\n', position + 1)
+    lines = content.split('\n')
+
+    usages = []
+    for match in TOKEN_PATTERN.finditer(content):
+        if match.group() != 'any':
+            continue
+        kind = usage_kind(content, match.start())
+        if kind is None:
+            continue
+        line_index = bisect.bisect_right(line_starts, match.start()) - 1
+        column = match.start() - line_starts[line_index] + 1
+        usages.append((line_index + 1, column, kind, lines[line_index].strip()[:200],
+                       enclosing_declaration(lines, line_index)))
+    return usages
+
+
+class AnyIndex:
+    """Persistent per-file `any` usages, refreshed incrementally"""
+
+    def __init__(self, root: str = '.', index_path: Optional[str] = None):
+        self.root = root
+        self.index_path = index_path or os.path.join(root, INDEX_FILE)
+        self.files: Dict[str, Dict] = {}
+        self.scanned = 0
+        self.hashed = 0
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') == INDEX_VERSION:
+                self.files = index['files']
+        except (OSError, ValueError):
+            pass
+
+    def source_files(self) -> List[str]:
+        found = []
+        for directory, dirs, files in os.walk(os.path.join(self.root, SCAN_ROOT)):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for name in files:
+                if name.endswith(EXTENSIONS) and not name.endswith('.d.ts'):
+                    found.append(os.path.relpath(os.path.join(directory, name), self.root).replace(os.sep, '/'))
+        return sorted(found)
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with the tree; returns True if anything changed"""
+        changed = False
+        current = {}
+        for path in self.source_files():
+            stat = os.stat(os.path.join(self.root, path))
+            entry = self.files.get(path)
+            if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                current[path] = entry
+                continue
+
+            with open(os.path.join(self.root, path), 'rb') as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            self.hashed += 1
+            if not entry or entry['sha256'] != digest:
+                self.scanned += 1
+                entry = {'sha256': digest, 'usages': scan(data.decode('utf-8', errors='replace'))}
+            entry = dict(entry, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            current[path] = entry
+            changed = True
+
+        if current.keys() != self.files.keys():
+            changed = True
+        self.files = current
+        if changed:
+            self.save()
+        return changed
+
+    def save(self):
+        tmp_path = f'{self.index_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def query(self, prefixes: Optional[List[str]] = None) -> List[Tuple[str, Usage]]:
+        """(path, usage) for every usage under the given path prefixes (default: all)
+
+        A prefix not starting with src/ is taken relative to src/, so
+        'services/ai' and 'src/services/ai' are the same query.
+        """
+        paths = sorted(self.files)
+        selected = []
+        for prefix in prefixes or ['']:
+            prefix = prefix.strip('/')
+            if prefix and prefix != SCAN_ROOT and not prefix.startswith(SCAN_ROOT + '/'):
+                prefix = f'{SCAN_ROOT}/{prefix}'
+            start = bisect.bisect_left(paths, prefix)
+            for path in paths[start:]:
+                if not path.startswith(prefix):
+                    break
+                if not prefix or path == prefix or path.startswith(prefix + '/'):
+                    selected.append(path)
+        return [(path, tuple(usage)) for path in sorted(set(selected)) for usage in self.files[path]['usages']]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Index and query explicit `any` usages in src/')
+    parser.add_argument('prefixes', nargs='*', help='Path prefixes to query, e.g. services/ai (default: all of src/)')
+    parser.add_argument('--root', default='.', help='Repository root (default: .)')
+    parser.add_argument('--index', help=f'Index file (default: <root>/{INDEX_FILE})')
+    parser.add_argument('--kind', action='append', help='Only usages of this kind (repeatable): '
+                                                        + ', '.join(sorted(set(KIND_BY_PREFIX.values()) | {'assertion'})))
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--files', action='store_true', help='Print matching file paths only (for codemod --files-from)')
+    output.add_argument('--count', action='store_true', help='Print usage counts per file')
+    output.add_argument('--json', action='store_true', help='Print usages as JSON lines')
+    parser.add_argument('--no-refresh', action='store_true', help='Query the index as it is, without checking the tree')
+    args = parser.parse_args()
+
+    index = AnyIndex(args.root, args.index)
+    if not args.no_refresh:
+        index.refresh()
+        print(f'Index: {len(index.files)} files, {index.hashed} hashed, {index.scanned} scanned', file=sys.stderr)
+
+    results = index.query(args.prefixes)
+    if args.kind:
+        results = [(path, usage) for path, usage in results if usage[2] in args.kind]
+
+    if args.files:
+        for path in sorted({path for path, _ in results}):
+            print(path)
+    elif args.count:
+        counts = {}
+        for path, _ in results:
+            counts[path] = counts.get(path, 0) + 1
+        for path, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+            print(f'{count:5d}  {path}')
+    elif args.json:
+        for path, (line, column, kind, text, context) in results:
+            print(json.dumps({'file': path, 'line': line, 'column': column, 'kind': kind,
+                              'text': text, 'context': context}, ensure_ascii=False))
+    else:
+        for path, (line, column, kind, text, context) in results:
+            print(f'{path}:{line}:{column}: [{kind}] {text}')
+            if context and context != text:
+                print(f'    in: {context}')
+
+    print(f'\n{len(results)} explicit `any` usages in {len({path for path, _ in results})} files', file=sys.stderr)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Multi-pattern codemod engine for TypeScript sweeps.
+
+Rules live in a JSON data file (see codemods/). Every rule that applies to a
+file is compiled into one alternation regex, so each file is scanned once no
+matter how many rules there are, and files are processed across a process pool.
+
+Rule fields:
+    name      unique rule name, used for hit counts
+    literal   exact text to replace, or
+    pattern   regular expression (numbered groups only; no inline global flags)
+    flags     optional regex flags for `pattern`, e.g. "s" or "im"
+    replace   replacement text; for `pattern` rules \\1 / \\g<1> expand groups
+    files     optional glob (default: src/**/*.{ts,tsx}); ** spans directories
+
+Matches never overlap: the scan runs left to right, and where several rules
+match at the same position the one listed first wins.
+
+    python codemod.py --rules codemods/no_explicit_any.json --dry-run
+"""
+
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+DEFAULT_FILES = 'src/**/*.{ts,tsx}'
+SKIP_DIRS = {'node_modules', '.git', 'dist', 'build'}
+SCOPED_FLAGS = set('imsx')
+
+
+def compile_glob(pattern: str) -> re.Pattern:
+    """Translate a path glob (*, ?, **, {a,b}) into a regex over '/'-separated paths"""
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+            continue
+        if char == '*':
+            out.append('[^/]*')
+        elif char == '?':
+            out.append('[^/]')
+        elif char == '{':
+            end = pattern.index('}', i)
+            out.append('(?:' + '|'.join(re.escape(option) for option in pattern[i + 1:end].split(',')) + ')')
+            i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return re.compile(''.join(out) + r'\Z')
+
+
+def glob_base(pattern: str) -> str:
+    """Leading path of a glob before its first wildcard, the directory (or file) to walk"""
+    parts = []
+    for part in pattern.split('/'):
+        if any(char in part for char in '*?{['):
+            break
+        parts.append(part)
+    return '/'.join(parts) or '.'
+
+
+class Rule:
+    def __init__(self, spec: Dict):
+        self.name = spec['name']
+        self.replace = spec['replace']
+        self.files = spec.get('files', DEFAULT_FILES)
+        self.file_regex = compile_glob(self.files)
+
+        if 'literal' in spec:
+            self.source = re.escape(spec['literal'])
+            self.expand = False
+        elif 'pattern' in spec:
+            flags = spec.get('flags', '')
+            if not set(flags) <= SCOPED_FLAGS:
+                raise ValueError(f"Rule {self.name!r}: flags must be drawn from 'imsx'")
+            self.source = f'(?{flags}:{spec["pattern"]})' if flags else f'(?:{spec["pattern"]})'
+            self.expand = True
+        else:
+            raise ValueError(f"Rule {self.name!r} needs a 'literal' or a 'pattern'")
+
+        # Standalone pattern, re-matched at a combined-matcher hit to expand its groups
+        self.regex = re.compile(self.source)
+
+
+def load_rules(path: str) -> List[Rule]:
+    with open(path, 'r', encoding='utf-8') as f:
+        specs = json.load(f)
+    rules = [Rule(spec) for spec in specs]
+
+    names = Counter(rule.name for rule in rules)
+    duplicates = [name for name, count in names.items() if count > 1]
+    if duplicates:
+        raise ValueError(f"Duplicate rule names: {', '.join(duplicates)}")
+    return rules
+
+
+class Codemod:
+    """Applies a rule set to file contents, one scan per file
+
+    Files that share the same applicable rules share one compiled matcher.
+    """
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        self.matchers: Dict[FrozenSet[int], re.Pattern] = {}
+
+    def rules_for(self, path: str) -> FrozenSet[int]:
+        path = path.replace(os.sep, '/')
+        return frozenset(i for i, rule in enumerate(self.rules) if rule.file_regex.match(path))
+
+    def matcher(self, indexes: FrozenSet[int]) -> re.Pattern:
+        matcher = self.matchers.get(indexes)
+        if matcher is None:
+            matcher = re.compile('|'.join(f'(?P<r{i}>{self.rules[i].source})' for i in sorted(indexes)))
+            self.matchers[indexes] = matcher
+        return matcher
+
+    def apply(self, path: str, content: str) -> Tuple[str, Counter]:
+        """Return the rewritten content and hits per rule name"""
+        indexes = self.rules_for(path)
+        hits = Counter()
+        if not indexes:
+            return content, hits
+
+        def substitute(match: re.Match) -> str:
+            rule = self.rules[int(match.lastgroup[1:])]
+            hits[rule.name] += 1
+            if rule.expand:
+                return rule.regex.match(content, match.start()).expand(rule.replace)
+            return rule.replace
+
+        return self.matcher(indexes).sub(substitute, content), hits
+
+
+def discover_files(rules: List[Rule], root: str) -> List[str]:
+    """Files under root matched by any rule's glob, walking only each glob's base"""
+    codemod = Codemod(rules)
+    found = set()
+    for base in sorted({glob_base(rule.files) for rule in rules}):
+        start = os.path.join(root, base)
+        if os.path.isfile(start):
+            found.add(base)
+            continue
+        for directory, dirs, files in os.walk(start):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            for name in files:
+                path = os.path.relpath(os.path.join(directory, name), root).replace(os.sep, '/')
+                if codemod.rules_for(path):
+                    found.add(path)
+    return sorted(found)
+
+
+_worker_codemod: Optional[Codemod] = None
+
+
+def _init_worker(rules_path: str):
+    global _worker_codemod
+    _worker_codemod = Codemod(load_rules(rules_path))
+
+
+def _process_chunk(task: Tuple[str, List[str], bool]) -> List[Tuple[str, Counter, Optional[str]]]:
+    """Pool task: rewrite (or diff, on a dry run) a chunk of files
+
+    Returns (path, hits, diff) for every file that has at least one hit.
+    """
+    root, paths, dry_run = task
+    results = []
+    for path in paths:
+        full_path = os.path.join(root, path)
+        with open(full_path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        new_content, hits = _worker_codemod.apply(path, content)
+        if not hits:
+            continue
+
+        diff = None
+        if dry_run:
+            diff = ''.join(difflib.unified_diff(
+                content.splitlines(keepends=True), new_content.splitlines(keepends=True),
+                fromfile=f'a/{path}', tofile=f'b/{path}'
+            ))
+        elif new_content != content:
+            tmp_path = f'{full_path}.codemod.tmp'
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(new_content)
+            os.replace(tmp_path, full_path)
+        results.append((path, hits, diff))
+    return results
+
+
+def run(rules_path: str, root: str = '.', files: Optional[Iterable[str]] = None, dry_run: bool = False,
+        workers: int = 1, chunk_size: int = 32) -> Tuple[List[Tuple[str, Counter, Optional[str]]], Counter, int]:
+    """Run a rule set over files (default: every file the rules' globs match)
+
+    Returns (per-file results, hits per rule, files scanned).
+    """
+    rules = load_rules(rules_path)
+    if files is None:
+        paths = discover_files(rules, root)
+    else:
+        codemod = Codemod(rules)
+        paths = sorted({path.replace(os.sep, '/') for path in files if codemod.rules_for(path)})
+
+    tasks = [(root, paths[i:i + chunk_size], dry_run) for i in range(0, len(paths), chunk_size)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rules_path,)) as pool:
+            chunks = list(pool.map(_process_chunk, tasks))
+    else:
+        _init_worker(rules_path)
+        chunks = [_process_chunk(task) for task in tasks]
+
+    results = [result for chunk in chunks for result in chunk]
+    totals = Counter({rule.name: 0 for rule in rules})
+    for _, hits, _ in results:
+        totals.update(hits)
+    return results, totals, len(paths)
+
+
+def read_file_list(path: str) -> List[str]:
+    """Paths listed one per line ('-' for stdin), e.g. the output of any_index.py --files"""
+    if path == '-':
+        return [line.strip() for line in sys.stdin if line.strip()]
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Apply a codemod rule set across the source tree')
+    parser.add_argument('--rules', required=True, help='Rule file (JSON)')
+    parser.add_argument('--root', default='.', help='Repository root the rule globs are relative to (default: .)')
+    parser.add_argument('--files-from', help="Only process the paths listed in this file ('-' for stdin), "
+                                             "instead of walking the rule globs")
+    parser.add_argument('--dry-run', action='store_true', help='Print unified diffs instead of writing files')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    files = read_file_list(args.files_from) if args.files_from else None
+    results, totals, scanned = run(args.rules, args.root, files, args.dry_run, args.workers)
+
+    if args.dry_run:
+        for _, _, diff in results:
+            sys.stdout.write(diff)
+
+    print(f'\n{"Would change" if args.dry_run else "Changed"} {len(results)} of {scanned} files', file=sys.stderr)
+    for name, count in totals.items():
+        print(f'  {name}: {count}', file=sys.stderr)
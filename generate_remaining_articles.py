@@ -4,6 +4,13 @@ Generate remaining blog articles (12-50) for AIBORG Learn Sphere
 Each article is 800-1200 words with proper structure and AIBORG CTA
 """
 
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from slugs import SLUG_INDEX_FILE, SlugIndex, slugify
+from sql_literals import sql_literal, sql_text_array
+
 # Article templates with full content
 articles = {
     12: {
@@ -156,21 +163,27 @@ INSERT INTO blog_posts (
   title, slug, excerpt, content, author_id, status, published_at,
   featured_image, category, tags, reading_time_minutes
 ) VALUES (
-  '{article_data['title']}',
-  '{article_data['slug']}',
-  '{article_data['excerpt']}',
-  '{article_data['content']}',
+  {sql_literal(article_data['title'])},
+  {sql_literal(article_data['slug'])},
+  {sql_literal(article_data['excerpt'])},
+  {sql_literal(article_data['content'])},
   'YOUR_AUTHOR_ID',
   'published',
   NOW(),
-  '/blog-images/{article_data['slug']}.jpg',
-  '{article_data['category']}',
-  ARRAY{article_data['tags']},
+  {sql_literal(f"/blog-images/{article_data['slug']}.jpg")},
+  {sql_literal(article_data['category'])},
+  {sql_text_array(article_data['tags'])},
   {article_data['reading_time']}
 );
 """
 
 if __name__ == "__main__":
+    # Issue every slug through the shared index before any SQL is written
+    slug_index = SlugIndex(SLUG_INDEX_FILE)
+    for num, data in articles.items():
+        data['slug'] = slug_index.issue(slugify(data['slug']), f"remaining:{num}")
+    slug_index.save()
+
     with open("/home/vik/aiborg_CC/aiborg-learn-sphere/blog-articles-complete-part2.sql", "a") as f:
         for num, data in articles.items():
             f.write(generate_article_sql(num, data))
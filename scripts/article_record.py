@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Compact Article Records
+A __slots__ record for articles moving through the pipeline, replacing
+per-article dicts and dict copies. Low-cardinality fields are interned so a
+million records share a handful of audience/category strings.
+"""
+
+import sys
+from typing import Dict, Optional
+
+# Serialized key order; matches the NDJSON the dict-based pipeline wrote
+MANIFEST_FIELDS = (
+    'title', 'slug', 'category', 'audience', 'excerpt', 'reading_time',
+    'days_ago', 'index', 'meta_title', 'meta_description'
+)
+CONTENT_FIELDS = ('content', 'featured_image', 'tags', 'seo_keywords')
+OPTIONAL_FIELDS = ('batch',)
+
+INTERNED_FIELDS = frozenset(('category', 'audience', 'batch'))
+
+_FIELDS = MANIFEST_FIELDS + CONTENT_FIELDS + OPTIONAL_FIELDS
+_FIELD_SET = frozenset(_FIELDS)
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+class ArticleRecord:
+    """One article; unset fields are None and are left out of to_dict()
+
+    Supports the read side of the dict interface (record['title'],
+    record.get('tags', [])) so existing stage code works unchanged. Keys outside
+    the known fields are kept in `extra` and round-trip through to_dict().
+    """
+
+    __slots__ = _FIELDS + ('extra',)
+
+    def __init__(self, title: str, slug: str, category: Optional[str] = None, audience: Optional[str] = None,
+                 excerpt: Optional[str] = None, reading_time: Optional[int] = None,
+                 days_ago: Optional[int] = None, index: Optional[int] = None,
+                 meta_title: Optional[str] = None, meta_description: Optional[str] = None,
+                 content: Optional[str] = None, featured_image: Optional[str] = None,
+                 tags: Optional[list] = None, seo_keywords: Optional[str] = None,
+                 batch: Optional[str] = None, extra: Optional[Dict] = None):
+        self.title = title
+        self.slug = slug
+        self.category = _intern(category)
+        self.audience = _intern(audience)
+        self.excerpt = excerpt
+        self.reading_time = reading_time
+        self.days_ago = days_ago
+        self.index = index
+        # Share the title/excerpt string when the meta field is a copy of it
+        self.meta_title = title if meta_title == title else meta_title
+        self.meta_description = excerpt if meta_description == excerpt else meta_description
+        self.content = content
+        self.featured_image = featured_image
+        self.tags = tags
+        self.seo_keywords = seo_keywords
+        self.batch = _intern(batch)
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, record: Dict) -> 'ArticleRecord':
+        if isinstance(record, cls):
+            return record
+        known = {key: value for key, value in record.items() if key in _FIELD_SET}
+        extra = {key: value for key, value in record.items() if key not in _FIELD_SET}
+        return cls(**known, extra=extra or None)
+
+    def to_dict(self) -> Dict:
+        data = {}
+        for field in _FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def get(self, key: str, default=None):
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extra.get(key, default) if self.extra else default
+
+    def __getitem__(self, key: str):
+        value = self.get(key)
+        if value is None and key not in self:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value):
+        if key in _FIELD_SET:
+            setattr(self, key, _intern(value) if key in INTERNED_FIELDS else value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        if key in _FIELD_SET:
+            return getattr(self, key) is not None
+        return bool(self.extra) and key in self.extra
+
+    def __eq__(self, other):
+        if isinstance(other, (ArticleRecord, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, ArticleRecord) else other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f'ArticleRecord(slug={self.slug!r}, audience={self.audience!r})'
+
+def record_to_json(value):
+    """json.dumps default= hook so records serialize like the dicts they replace"""
+    if isinstance(value, ArticleRecord):
+        return value.to_dict()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+End-to-End Pipeline Benchmark
+Runs manifest -> content -> SQL -> inventory on synthetic manifests of
+configurable size and records time, peak RSS, output bytes and articles/sec
+per stage, so runs can be compared across commits
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from corpus_io import SCRIPTS_DIR
+from generate_sql_scripts import BATCH_INDEX_FILE
+
+RESULTS_DIR = os.path.join(SCRIPTS_DIR, 'benchmarks', 'results')
+
+# Metrics where a higher value is a regression
+REGRESSION_METRICS = ('seconds', 'peak_rss_kb')
+
+def pipeline_stages(work_dir: str, count: int, workers: int) -> List[Dict]:
+    """The four pipeline stages, each a script invocation with its output path"""
+    manifest = os.path.join(work_dir, 'manifest.ndjson')
+    content = os.path.join(work_dir, 'content.ndjson')
+    sql_dir = os.path.join(work_dir, 'blog_inserts')
+    inventory = os.path.join(work_dir, 'inventory.csv')
+
+    return [
+        {'name': 'manifest', 'output': manifest,
+         'argv': ['generate_blog_articles.py', '--count', str(count), '--output', manifest]},
+        {'name': 'content', 'output': content,
+         'argv': ['content_generator.py', '--input', manifest, '--output', content,
+                  '--workers', str(workers), '--no-cache']},
+        {'name': 'sql', 'output': sql_dir,
+         'argv': ['generate_sql_scripts.py', '--input', content, '--output-dir', sql_dir]},
+        {'name': 'inventory', 'output': inventory,
+         'argv': ['create_content_inventory.py', '--input', content, '--output', inventory,
+                  '--batch-index', os.path.join(sql_dir, BATCH_INDEX_FILE)]}
+    ]
+
+def output_bytes(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+def run_stage(stage: Dict, count: int) -> Dict:
+    """Run one stage to completion and measure it
+
+    Peak RSS comes from the child's own rusage, so each stage is measured in
+    isolation from the benchmark process and from the other stages.
+    """
+    argv = [sys.executable, os.path.join(SCRIPTS_DIR, stage['argv'][0])] + stage['argv'][1:]
+
+    # stderr goes to a temp file, not a pipe: a stage that logs more than the
+    # pipe buffer would block on it while we wait for the rusage
+    with tempfile.TemporaryFile() as errors:
+        start = time.perf_counter()
+        proc = subprocess.Popen(argv, cwd=SCRIPTS_DIR, stdout=subprocess.DEVNULL, stderr=errors)
+        _, status, rusage = os.wait4(proc.pid, 0)
+        seconds = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        errors.seek(0)
+        stderr = errors.read().decode('utf-8', 'replace')
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"Stage {stage['name']} failed:\n{stderr}")
+
+    return {
+        'seconds': round(seconds, 3),
+        # ru_maxrss is kilobytes on Linux and bytes on macOS
+        'peak_rss_kb': rusage.ru_maxrss // 1024 if sys.platform == 'darwin' else rusage.ru_maxrss,
+        'output_bytes': output_bytes(stage['output']),
+        'articles_per_sec': round(count / seconds, 1) if seconds else None
+    }
+
+def benchmark_size(count: int, workers: int, keep: bool = False) -> Dict:
+    work_dir = tempfile.mkdtemp(prefix=f'blog_bench_{count}_')
+    print(f"\n📏 {count:,} articles (work dir: {work_dir})")
+
+    results = {}
+    try:
+        for stage in pipeline_stages(work_dir, count, workers):
+            results[stage['name']] = run_stage(stage, count)
+            r = results[stage['name']]
+            print(f"   {stage['name']:<10} {r['seconds']:>9.2f}s  {r['peak_rss_kb'] / 1024:>8.1f} MB RSS  "
+                  f"{r['output_bytes'] / (1024 * 1024):>9.1f} MB out  {r['articles_per_sec']:>10,.1f} articles/s")
+    finally:
+        if not keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    total = sum(r['seconds'] for r in results.values())
+    results['total'] = {
+        'seconds': round(total, 3),
+        'peak_rss_kb': max(r['peak_rss_kb'] for r in results.values()),
+        'output_bytes': sum(r['output_bytes'] for r in results.values()),
+        'articles_per_sec': round(count / total, 1) if total else None
+    }
+    return results
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def find_regressions(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Compare two result files; a metric regresses when it grows by more than threshold"""
+    regressions = []
+    for size, stages in current['sizes'].items():
+        base_stages = baseline.get('sizes', {}).get(size)
+        if not base_stages:
+            continue
+        for stage, metrics in stages.items():
+            base_metrics = base_stages.get(stage, {})
+            for metric in REGRESSION_METRICS:
+                before, after = base_metrics.get(metric), metrics.get(metric)
+                if not before or after is None:
+                    continue
+                change = (after - before) / before
+                if change > threshold:
+                    regressions.append(f"{size} articles / {stage} / {metric}: "
+                                       f"{before} -> {after} (+{change:.0%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the manifest -> content -> SQL -> inventory pipeline')
+    parser.add_argument('--sizes', default='500',
+                        help='Comma-separated article counts (e.g. 500,50000,1000000; default: 500)')
+    parser.add_argument('--workers', type=int, default=1, help='Content generator worker processes (default: 1)')
+    parser.add_argument('--output', help='Results JSON path (default: scripts/benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--baseline', help='Earlier results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Relative slowdown or RSS growth that counts as a regression (default: 0.15)')
+    parser.add_argument('--keep', action='store_true', help='Keep the generated files for inspection')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    timestamp = datetime.now(timezone.utc)
+
+    print("🏁 Benchmarking the article pipeline")
+    report = {
+        'commit': git_commit(),
+        'timestamp': timestamp.isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'workers': args.workers,
+        'sizes': {str(size): benchmark_size(size, args.workers, args.keep) for size in sizes}
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{timestamp.strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results saved to {output}")
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = find_regressions(report, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regressions beyond {args.threshold:.0%} vs {args.baseline} "
+              f"(commit {baseline.get('commit')}):")
+        for regression in regressions:
+            print(f"   {regression}")
+        return 1
+
+    print(f"\n✅ No regressions beyond {args.threshold:.0%} vs {args.baseline}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Parallel Batch Loader for Blog Articles
+Runs the generated blog_inserts SQL files through psql over a bounded pool of
+connections, with retries for transient errors and a ledger so reruns resume
+
+Connection settings come from the standard libpq environment variables
+(PGHOST, PGPORT, PGUSER, PGDATABASE, PGPASSWORD) or --dsn, so the same command
+works against Supabase or a local container, e.g.:
+
+    docker run -d -p 5432:5432 -e POSTGRES_PASSWORD=postgres postgres:15
+    PGHOST=localhost PGUSER=postgres PGPASSWORD=postgres python blog_loader.py blog_inserts
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import metrics
+from generate_sql_scripts import TAG_STAGE_FILE
+from metrics import METRICS
+from sql_writer import DECOMPRESSORS
+
+LEDGER_FILE = '.load_ledger.jsonl'
+
+# Files the generator writes to run before any batch, in order. Only these are
+# staged: other 00_*.sql scripts in blog_inserts are manual one-off fixes
+STAGE_FILES = [TAG_STAGE_FILE]
+
+# psql/server messages that indicate the batch can simply be retried
+TRANSIENT_ERRORS = re.compile(
+    r'could not connect|connection to server|server closed the connection|'
+    r'connection refused|timeout expired|too many connections|'
+    r'remaining connection slots|the database system is (starting up|shutting down)|'
+    r'deadlock detected|could not serialize access|canceling statement due to lock timeout',
+    re.IGNORECASE
+)
+
+# Command tags printed by psql for each statement, e.g. "INSERT 0 50" or "COPY 50"
+ROW_COUNT_TAG = re.compile(r'^(?:INSERT \d+|UPDATE|DELETE|COPY|MERGE) (\d+)$', re.MULTILINE)
+
+class BatchLoadError(Exception):
+    """Raised when a batch fails with a non-transient error or runs out of retries"""
+
+class LoadLedger:
+    """Append-only record of batch files that loaded successfully"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.completed: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn final line from an interrupted run
+                    self.completed[entry['file']] = entry['sha256']
+
+    def is_done(self, filename: str, digest: str) -> bool:
+        return self.completed.get(filename) == digest
+
+    def record(self, filename: str, digest: str, rows: int, seconds: float):
+        entry = {
+            'file': filename,
+            'sha256': digest,
+            'rows': rows,
+            'seconds': round(seconds, 3),
+            'loaded_at': datetime.now().isoformat(timespec='seconds')
+        }
+        with self.lock:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.completed[filename] = digest
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a batch file, so edited batches are reloaded"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def psql_command(dsn: Optional[str]) -> List[str]:
+    """Base psql invocation; batch files rely on ON_ERROR_STOP to roll back cleanly"""
+    command = ['psql', '-X', '-v', 'ON_ERROR_STOP=1', '-v', 'skip_rls_toggle=1']
+    if dsn:
+        command.extend(['-d', dsn])
+    return command
+
+def run_sql(dsn: Optional[str], sql: str):
+    """Run a single SQL command, raising on failure"""
+    result = subprocess.run(psql_command(dsn) + ['-c', sql], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise BatchLoadError(result.stderr.strip())
+
+def find_sql_files(batch_dir: str, pattern: str) -> List[str]:
+    """Files matching pattern, plain or compressed (pattern + .gz / .zst)"""
+    paths = []
+    for suffix in [''] + list(DECOMPRESSORS):
+        paths.extend(glob.glob(os.path.join(batch_dir, pattern + suffix)))
+    return sorted(paths)
+
+def run_psql_file(path: str, dsn: Optional[str]) -> subprocess.CompletedProcess:
+    """Run a SQL file through psql; compressed files are decompressed into its stdin"""
+    directory, filename = os.path.split(path)
+    decompressor = DECOMPRESSORS.get(os.path.splitext(filename)[1])
+    if decompressor is None:
+        return subprocess.run(psql_command(dsn) + ['-f', filename],
+                              cwd=directory or '.', capture_output=True, text=True)
+
+    source = subprocess.Popen(decompressor + [filename], cwd=directory or '.',
+                              stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        result = subprocess.run(psql_command(dsn) + ['-f', '-'], stdin=source.stdout,
+                                cwd=directory or '.', capture_output=True, text=True)
+    finally:
+        source.stdout.close()
+        source_error = source.stderr.read().decode('utf-8', errors='replace')
+        source.stderr.close()
+        source.wait()
+    if source.returncode != 0 and result.returncode == 0:
+        # A truncated archive must not count as a successful load
+        result.returncode = source.returncode
+        result.stderr = source_error or f'{decompressor[0]} exited with status {source.returncode}'
+    return result
+
+def load_file(path: str, dsn: Optional[str], retries: int, backoff: float) -> int:
+    """Load one SQL file (.sql, .sql.gz or .sql.zst), retrying transient failures; returns rows affected"""
+    filename = os.path.basename(path)
+
+    for attempt in range(retries + 1):
+        result = run_psql_file(path, dsn)
+        if result.returncode == 0:
+            return sum(int(count) for count in ROW_COUNT_TAG.findall(result.stdout))
+        METRICS.inc('batch_errors_total')
+
+        error = result.stderr.strip()
+        if attempt == retries or not TRANSIENT_ERRORS.search(error):
+            raise BatchLoadError(error or f'psql exited with status {result.returncode}')
+
+        delay = backoff * (2 ** attempt) * (1 + random.random())
+        print(f"  ↻ {filename}: transient error, retrying in {delay:.1f}s ({attempt + 1}/{retries})")
+        METRICS.inc('batch_retries_total')
+        time.sleep(delay)
+
+def load_batches(batch_dir: str, pattern: str = 'batch_*.sql', workers: int = 4,
+                 dsn: Optional[str] = None, retries: int = 3, backoff: float = 1.0) -> bool:
+    """Load stage files in order, then batch files concurrently; returns True if all succeeded"""
+
+    ledger = LoadLedger(os.path.join(batch_dir, LEDGER_FILE))
+    stage_files = [path for name in STAGE_FILES for path in find_sql_files(batch_dir, name)]
+    batch_files = find_sql_files(batch_dir, pattern)
+
+    total_rows = 0
+    failed = []
+    skipped = 0
+    start_time = time.time()
+
+    def run_one(path: str) -> int:
+        filename = os.path.basename(path)
+        digest = file_digest(path)
+        if ledger.is_done(filename, digest):
+            METRICS.inc('batches_skipped_total')
+            return -1
+        batch_start = time.time()
+        rows = load_file(path, dsn, retries, backoff)
+        seconds = time.time() - batch_start
+        ledger.record(filename, digest, rows, seconds)
+        METRICS.observe('batch_load_seconds', seconds)
+        METRICS.inc('batches_loaded_total')
+        METRICS.inc('rows_loaded_total', rows)
+        print(f"  ✓ {filename}: {rows} rows in {seconds:.1f}s")
+        return rows
+
+    print(f"Loading {len(batch_files)} batch files from {batch_dir} with {workers} workers")
+    print("")
+
+    # Stage files (e.g. the tag vocabulary) must land before any batch
+    for path in stage_files:
+        try:
+            rows = run_one(path)
+        except BatchLoadError as e:
+            print(f"  ✗ {os.path.basename(path)} failed: {e}")
+            return False
+        if rows < 0:
+            skipped += 1
+        else:
+            total_rows += rows
+
+    # Toggle RLS once for the whole run instead of per batch
+    run_sql(dsn, 'ALTER TABLE blog_posts DISABLE ROW LEVEL SECURITY; '
+                 'ALTER TABLE blog_post_tags DISABLE ROW LEVEL SECURITY;')
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_one, path): path for path in batch_files}
+            for future in as_completed(futures):
+                filename = os.path.basename(futures[future])
+                try:
+                    rows = future.result()
+                except BatchLoadError as e:
+                    failed.append(filename)
+                    print(f"  ✗ {filename} failed: {e}")
+                    continue
+                if rows < 0:
+                    skipped += 1
+                else:
+                    total_rows += rows
+    finally:
+        run_sql(dsn, 'ALTER TABLE blog_posts ENABLE ROW LEVEL SECURITY; '
+                     'ALTER TABLE blog_post_tags ENABLE ROW LEVEL SECURITY;')
+
+    elapsed = time.time() - start_time
+    rate = total_rows / elapsed if elapsed > 0 else 0
+
+    print(f"""
+========================================
+📦 BATCH LOAD SUMMARY
+========================================
+✅ Loaded: {len(stage_files) + len(batch_files) - skipped - len(failed)} files
+⏭️  Skipped (already in ledger): {skipped}
+❌ Failed: {len(failed)}{' (' + ', '.join(sorted(failed)) + ')' if failed else ''}
+📝 Rows: {total_rows:,}
+⏱️  Elapsed: {elapsed:.1f}s ({rate:,.0f} rows/sec)
+========================================
+""")
+
+    return not failed
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load generated blog batch files into Postgres')
+    parser.add_argument('batch_dir', nargs='?', default='blog_inserts',
+                        help='Directory containing the generated SQL files (default: blog_inserts)')
+    parser.add_argument('--pattern', default='batch_*.sql',
+                        help='Glob for batch files; .gz / .zst variants are included (default: batch_*.sql)')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent connections (default: 4)')
+    parser.add_argument('--dsn', help='Connection string; defaults to the PG* environment variables')
+    parser.add_argument('--retries', type=int, default=3, help='Retries per batch for transient errors (default: 3)')
+    parser.add_argument('--backoff', type=float, default=1.0, help='Initial retry delay in seconds (default: 1.0)')
+    parser.add_argument('--reset', action='store_true', help='Ignore and clear the ledger before loading')
+    metrics.add_metrics_argument(parser)
+    args = parser.parse_args()
+
+    metrics.enable('load', args.metrics_dir)
+
+    if args.reset:
+        ledger_path = os.path.join(args.batch_dir, LEDGER_FILE)
+        if os.path.exists(ledger_path):
+            os.remove(ledger_path)
+
+    ok = load_batches(args.batch_dir, args.pattern, args.workers, args.dsn, args.retries, args.backoff)
+    raise SystemExit(0 if ok else 1)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Delta Sync for Blog Articles
+Diffs the local article corpus against a snapshot of blog_posts and writes
+batch files for only the rows that differ, so pushing an edit to one article
+sends one small merge instead of the whole corpus.
+
+The snapshot is (slug, content_hash, updated_at) for every post, exported in
+a single COPY. It is the build side of a hash join the corpus streams through:
+new slugs become inserts, hash mismatches become updates (both through the
+staging merge of generate_sql_scripts.py --format merge), and posts left
+unmatched are reported as deletes, emitted only with --delete.
+
+    python blog_sync.py --dry-run
+    python blog_sync.py --apply --workers 4
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import metrics
+from blog_loader import LEDGER_FILE, STAGE_FILES, BatchLoadError, load_batches, psql_command
+from corpus_io import CONTENT_FILE, SCRIPTS_DIR, read_records
+from generate_sql_scripts import (SYSTEM_AUTHOR_ID, add_batch_arguments, blog_post_content_hash, blog_post_values,
+                                  collect_tag_vocabulary, generate_merge_batch, partition_articles,
+                                  write_tag_stage)
+from metrics import METRICS, write_text
+from sql_literals import sql_text_array
+from sql_writer import COMPRESSION_SUFFIXES, add_compression_argument, write_sql
+
+SNAPSHOT_QUERY = 'COPY (SELECT slug, content_hash, updated_at FROM blog_posts) TO STDOUT'
+
+DELETE_FILE = 'batch_deletes_blog_articles.sql'
+REPORT_FILE = 'sync_report.json'
+
+# slug -> (content_hash, updated_at); content_hash is None for rows never hashed
+Snapshot = Dict[str, Tuple[Optional[str], str]]
+
+def parse_snapshot(lines: Iterable[str]) -> Snapshot:
+    """Build the snapshot hash table from COPY text rows"""
+    snapshot = {}
+    for line in lines:
+        line = line.rstrip('\n')
+        if not line:
+            continue
+        slug, content_hash, updated_at = line.split('\t')
+        snapshot[slug] = (None if content_hash == '\\N' else content_hash, updated_at)
+    return snapshot
+
+def fetch_snapshot(dsn: Optional[str]) -> Snapshot:
+    """Export (slug, content_hash, updated_at) for every post in one query, streamed"""
+    process = subprocess.Popen(psql_command(dsn) + ['-c', SNAPSHOT_QUERY],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    snapshot = parse_snapshot(process.stdout)
+    error = process.stderr.read()
+    if process.wait() != 0:
+        raise BatchLoadError(error.strip() or f'psql exited with status {process.returncode}')
+    return snapshot
+
+def read_snapshot(path: str) -> Snapshot:
+    """Load a snapshot saved earlier, e.g. psql -c "<SNAPSHOT_QUERY>" > snapshot.tsv"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_snapshot(f)
+
+class SyncPlan:
+    """Differences between the corpus and a snapshot"""
+
+    def __init__(self, snapshot: Snapshot):
+        self.remaining = dict(snapshot)
+        self.seen = set()
+        self.inserts: List[str] = []
+        self.updates: List[Tuple[str, str]] = []  # (slug, remote updated_at)
+        self.unchanged = 0
+        self.duplicates: List[str] = []
+
+    def changed_articles(self, articles: Iterable[Dict]) -> Iterator[Dict]:
+        """Probe each article against the snapshot, yielding only inserts and updates
+
+        Matched slugs are removed from the build side, so whatever is left once
+        the corpus is exhausted is the set of posts the corpus no longer has.
+        """
+        for article in articles:
+            slug = article['slug']
+            if slug in self.seen:
+                self.duplicates.append(slug)
+                continue
+            self.seen.add(slug)
+
+            with METRICS.time('sync_hash_seconds'):
+                content_hash = blog_post_content_hash(blog_post_values(article, 0, article['category']))
+            remote = self.remaining.pop(slug, None)
+            if remote is None:
+                self.inserts.append(slug)
+            elif remote[0] != content_hash:
+                self.updates.append((slug, remote[1]))
+            else:
+                self.unchanged += 1
+                continue
+            yield article
+
+    @property
+    def deletes(self) -> List[str]:
+        return sorted(self.remaining)
+
+    def report(self) -> Dict:
+        return {
+            'inserts': self.inserts,
+            'updates': [{'slug': slug, 'remote_updated_at': updated_at} for slug, updated_at in self.updates],
+            'deletes': [{'slug': slug, 'remote_updated_at': self.remaining[slug][1]} for slug in self.deletes],
+            'unchanged': self.unchanged,
+            'duplicate_slugs_skipped': self.duplicates,
+        }
+
+def generate_delete_file(slugs: List[str]) -> str:
+    """Delete posts missing from the corpus; only generated (system author) posts are touched"""
+    return f"""-- ========================================
+-- Sync deletes: {len(slugs)} posts no longer in the corpus
+-- Posts written by other authors are never deleted
+-- ========================================
+
+BEGIN;
+
+DELETE FROM blog_posts
+WHERE slug = ANY({sql_text_array(slugs)})
+  AND author_id = '{SYSTEM_AUTHOR_ID}';
+
+COMMIT;
+"""
+
+def clear_output(output_dir: str):
+    """Remove batch and stage files from a previous sync, so only this delta is loaded
+
+    The load ledger goes too: a delta can repeat an earlier one byte for byte
+    (an edit reverted and made again), and must still be loaded.
+    """
+    for pattern in ['batch_*.sql'] + STAGE_FILES:
+        for suffix in [''] + list(COMPRESSION_SUFFIXES.values()):
+            for path in glob.glob(os.path.join(output_dir, pattern + suffix)):
+                os.remove(path)
+    ledger_path = os.path.join(output_dir, LEDGER_FILE)
+    if os.path.exists(ledger_path):
+        os.remove(ledger_path)
+
+def write_sync(articles: Iterable[Dict], snapshot: Snapshot, output_dir: str, max_batch_bytes: int,
+               max_batch_statements: int, delete: bool, compression: Optional[str] = None) -> Tuple[SyncPlan, int]:
+    """Write merge batches for changed articles (and deletes if asked); returns (plan, bytes written)"""
+    os.makedirs(output_dir, exist_ok=True)
+    clear_output(output_dir)
+
+    plan = SyncPlan(snapshot)
+    vocabulary = {}
+    written = 0
+    batches = partition_articles(plan.changed_articles(articles), max_batch_bytes, max_batch_statements)
+    for batch_num, batch_articles in enumerate(batches, 1):
+        collect_tag_vocabulary(batch_articles, vocabulary)
+        with METRICS.time('sql_render_seconds'):
+            written += write_sql(f'{output_dir}/batch_{batch_num:02d}_blog_articles.sql',
+                                 generate_merge_batch(batch_articles, batch_num), compression)
+        print(f"  ✓ Generated merge batch {batch_num:02d}: {len(batch_articles)} articles")
+
+    if vocabulary:
+        write_tag_stage(output_dir, vocabulary)
+    if delete and plan.deletes:
+        written += write_sql(f'{output_dir}/{DELETE_FILE}', [generate_delete_file(plan.deletes)], compression)
+        print(f"  ✓ Generated deletes: {len(plan.deletes)} posts")
+
+    write_text(f'{output_dir}/{REPORT_FILE}', json.dumps(plan.report(), indent=2) + '\n')
+
+    METRICS.inc('sync_inserts_total', len(plan.inserts))
+    METRICS.inc('sync_updates_total', len(plan.updates))
+    METRICS.inc('sync_unchanged_total', plan.unchanged)
+    METRICS.inc('sync_deletes_total', len(plan.deletes))
+    return plan, written
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sync blog_posts with the local corpus, sending only the differences')
+    parser.add_argument('--input', default=CONTENT_FILE, help="Article corpus (NDJSON), or '-' for stdin")
+    parser.add_argument('--output-dir', default=os.path.join(SCRIPTS_DIR, 'blog_sync'),
+                        help='Directory for the delta batch files (default: scripts/blog_sync)')
+    parser.add_argument('--snapshot', help='Use a saved snapshot (COPY text: slug, content_hash, updated_at) '
+                                           'instead of querying the database')
+    parser.add_argument('--dsn', help='Connection string; defaults to the PG* environment variables')
+    add_batch_arguments(parser)
+    add_compression_argument(parser)
+    parser.add_argument('--delete', action='store_true',
+                        help='Also delete generated posts missing from the corpus (default: report them only)')
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument('--dry-run', action='store_true', help='Report the differences without writing batch files')
+    action.add_argument('--apply', action='store_true', help='Load the delta with blog_loader after writing it')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent connections for --apply (default: 4)')
+    metrics.add_metrics_argument(parser)
+    args = parser.parse_args()
+
+    metrics.enable('sync', args.metrics_dir)
+
+    print(f"📸 Reading snapshot from {args.snapshot or 'blog_posts'}...")
+    with METRICS.time('sync_snapshot_seconds'):
+        snapshot = read_snapshot(args.snapshot) if args.snapshot else fetch_snapshot(args.dsn)
+    print(f"   {len(snapshot):,} posts in snapshot")
+
+    articles = read_records(args.input)
+    if args.dry_run:
+        plan = SyncPlan(snapshot)
+        for _ in plan.changed_articles(articles):
+            pass
+        written = 0
+    else:
+        print(f"🔍 Diffing {args.input} against the snapshot...")
+        plan, written = write_sync(articles, snapshot, args.output_dir, args.max_batch_bytes,
+                                   args.max_batch_statements, args.delete,
+                                   None if args.compress == 'none' else args.compress)
+
+    print(f"""
+========================================
+🔄 SYNC SUMMARY
+========================================
+➕ Inserts: {len(plan.inserts):,}
+✏️  Updates: {len(plan.updates):,}
+➖ Deletes: {len(plan.deletes):,}{'' if args.delete else ' (reported only; pass --delete to apply)'}
+⏸️  Unchanged: {plan.unchanged:,}
+⚠️  Duplicate slugs skipped: {len(plan.duplicates):,}
+📦 SQL to send: {written / 1024:,.1f} KB
+========================================""")
+
+    if args.dry_run:
+        for slug in plan.inserts[:20]:
+            print(f"  + {slug}")
+        for slug, _ in plan.updates[:20]:
+            print(f"  ~ {slug}")
+        for slug in plan.deletes[:20]:
+            print(f"  - {slug}")
+        raise SystemExit(0)
+
+    print(f"Delta written to {args.output_dir}/ ({REPORT_FILE} lists every slug)")
+    if args.apply:
+        if not plan.inserts and not plan.updates and not (args.delete and plan.deletes):
+            print("✅ Already in sync")
+            raise SystemExit(0)
+        ok = load_batches(args.output_dir, workers=args.workers, dsn=args.dsn)
+        raise SystemExit(0 if ok else 1)
+    print(f"\nTo apply: python blog_loader.py {args.output_dir} --workers 4")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Build Cache for Generated Articles
+Stores generated articles on disk keyed by a hash of the manifest record and
+the generator fingerprint, with size-bounded LRU eviction
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from article_record import record_to_json
+
+class ContentCache:
+    """On-disk article cache; entries are evicted least-recently-used first"""
+
+    def __init__(self, cache_dir: str, fingerprint: str, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.fingerprint = fingerprint
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.total_bytes = sum(size for _, size, _ in self._entries())
+
+    def key(self, record: Dict) -> str:
+        """Content address of a manifest record under the current generator"""
+        payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=record_to_json)
+        return hashlib.sha256(f'{self.fingerprint}\n{payload}'.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f'{key}.json')
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached article, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        os.utime(path)  # Mark as recently used
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict):
+        """Store an article, evicting old entries if the cache grows past max_bytes"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        data = json.dumps(value, ensure_ascii=False, default=record_to_json).encode('utf-8')
+        try:
+            replaced = os.path.getsize(path)  # Overwriting an entry frees its old size
+        except OSError:
+            replaced = 0
+
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        self.total_bytes += len(data) - replaced
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Remove least-recently-used entries until the cache is at 90% of max_bytes"""
+        target = int(self.max_bytes * 0.9)
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self.total_bytes = sum(size for _, size, _ in entries)
+
+        for path, size, _ in entries:
+            if self.total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def _entries(self):
+        """Yield (path, size, mtime) for every cache entry"""
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def summary(self) -> str:
+        return (f"{self.hits} hits, {self.misses} misses, {self.evictions} evicted, "
+                f"{self.total_bytes / (1024 * 1024):.1f} MB on disk")
@@ -4,9 +4,27 @@ Content Generator for Blog Articles
 Creates comprehensive, audience-appropriate content for each article
 """
 
+import argparse
+import hashlib
 import json
+import os
 import random
-from typing import Dict, List
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from article_record import ArticleRecord
+from content_cache import ContentCache
+from corpus_io import CONTENT_FILE, CORPUS_NEWLINE, MANIFEST_FILE, SCRIPTS_DIR, iter_batches, read_records, write_records
+from document_model import parse_document
+import metrics
+from metrics import METRICS
+from template_engine import CompiledTemplate, compile_template_set
+
+# Bump when the section generators or metadata logic change, so cached articles are rebuilt
+GENERATOR_VERSION = '2'
+
+CACHE_DIR = os.path.join(SCRIPTS_DIR, '.content_cache')
 
 # Content templates by audience
 YOUNG_LEARNERS_TEMPLATES = {
@@ -119,45 +137,62 @@ BUSINESS_OWNERS_TEMPLATES = {
     ]
 }
 
-def generate_content_section(template: str, topic: str, context: Dict) -> str:
+# Placeholders the templates may use, with the values used when a context omits them
+DEFAULT_CONTEXT = {
+    'activity': 'interact with technology',
+    'area': 'business operations',
+    'metric': '30-50%',
+    'statistic': 'Recent studies show',
+    'question': 'how this works',
+    'scenario': 'a world where technology helps everyone',
+    'fact': 'technology is amazing'
+}
+
+TEMPLATE_PLACEHOLDERS = frozenset(DEFAULT_CONTEXT) | {'topic'}
+
+# Compiled once at import; unknown placeholders fail here rather than mid-run
+COMPILED_TEMPLATES = {
+    'Young Learners': compile_template_set(YOUNG_LEARNERS_TEMPLATES, TEMPLATE_PLACEHOLDERS),
+    'Teenagers': compile_template_set(TEENAGERS_TEMPLATES, TEMPLATE_PLACEHOLDERS),
+    'Professionals': compile_template_set(PROFESSIONALS_TEMPLATES, TEMPLATE_PLACEHOLDERS),
+    'Business Owners': compile_template_set(BUSINESS_OWNERS_TEMPLATES, TEMPLATE_PLACEHOLDERS)
+}
+
+def generate_content_section(template: CompiledTemplate, topic: str, context: Dict) -> str:
     """Generate a content section based on template"""
-    # Replace placeholders
-    content = template.replace('{topic}', topic)
-    content = content.replace('{activity}', context.get('activity', 'interact with technology'))
-    content = content.replace('{area}', context.get('area', 'business operations'))
-    content = content.replace('{metric}', context.get('metric', '30-50%'))
-    content = content.replace('{statistic}', context.get('statistic', 'Recent studies show'))
-    content = content.replace('{question}', context.get('question', 'how this works'))
-    content = content.replace('{scenario}', context.get('scenario', 'a world where technology helps everyone'))
-    content = content.replace('{fact}', context.get('fact', 'technology is amazing'))
-
-    return content
-
-def generate_article_content(article: Dict) -> str:
+    return template.render({**DEFAULT_CONTEXT, **context, 'topic': topic})
+
+def article_rng(article: Dict) -> random.Random:
+    """Independent RNG seeded from the article slug, so output is reproducible"""
+    digest = hashlib.sha256(article['slug'].encode('utf-8')).digest()
+    return random.Random(int.from_bytes(digest[:8], 'big'))
+
+def generate_article_content(article: Dict, rng: Optional[random.Random] = None) -> str:
     """Generate full article content based on article metadata"""
+    rng = rng or random
     title = article['title']
     audience = article['audience']
     category = article['category']
 
     # Select appropriate template
     if audience == 'Young Learners':
-        templates = YOUNG_LEARNERS_TEMPLATES
+        templates = COMPILED_TEMPLATES['Young Learners']
         word_count_range = (800, 1500)
     elif audience == 'Teenagers':
-        templates = TEENAGERS_TEMPLATES
+        templates = COMPILED_TEMPLATES['Teenagers']
         word_count_range = (1200, 2000)
     elif audience == 'Professionals':
-        templates = PROFESSIONALS_TEMPLATES
+        templates = COMPILED_TEMPLATES['Professionals']
         word_count_range = (1500, 2500)
     else:  # Business Owners
-        templates = BUSINESS_OWNERS_TEMPLATES
+        templates = COMPILED_TEMPLATES['Business Owners']
         word_count_range = (1800, 3000)
 
     # Build article content
     content_parts = []
 
     # Introduction
-    intro = random.choice(templates['intro'])
+    intro = rng.choice(templates['intro'])
     intro = generate_content_section(intro, title, {
         'activity': 'learn and grow',
         'area': 'this field',
@@ -171,11 +206,11 @@ def generate_article_content(article: Dict) -> str:
     content_parts.append('')
 
     # Main sections
-    num_sections = random.randint(4, 7)
+    num_sections = rng.randint(4, 7)
     section_templates = templates['sections'][:num_sections]
 
     for section_title in section_templates:
-        section_heading = section_title.replace('{topic}', title)
+        section_heading = section_title.render({'topic': title})
         content_parts.append(f'## {section_heading}')
         content_parts.append('')
 
@@ -193,11 +228,13 @@ def generate_article_content(article: Dict) -> str:
         content_parts.append('')
 
     # Conclusion
-    outro = random.choice(templates['outro'])
+    outro = rng.choice(templates['outro'])
     outro = generate_content_section(outro, title, {})
     content_parts.append(outro)
 
-    return '\\n'.join(content_parts)
+    # Counted once per article: per-fill metrics would cost as much as the fills
+    METRICS.inc('template_fills_total', 2 + len(section_templates))
+    return CORPUS_NEWLINE.join(content_parts)
 
 def generate_young_learners_section(heading: str, topic: str) -> List[str]:
     """Generate age-appropriate content for young learners"""
@@ -310,12 +347,21 @@ def generate_business_section(heading: str, topic: str) -> List[str]:
 
     return paragraphs
 
-def enhance_article_with_metadata(article: Dict, content: str) -> Dict:
-    """Add generated content and additional metadata"""
-    article_copy = article.copy()
+def enhance_article_with_metadata(article: ArticleRecord, content: str,
+                                  rng: Optional[random.Random] = None) -> ArticleRecord:
+    """Add generated content and additional metadata
+
+    Fills in the record's content fields in place (no per-article copy); a
+    plain dict is converted to a new record first and left untouched.
+    """
+    rng = rng or random
+    if isinstance(article, ArticleRecord):
+        record = article
+    else:
+        record = ArticleRecord.from_dict(article)
 
     # Add content
-    article_copy['content'] = content
+    record.content = content
 
     # Generate featured image based on category
     image_keywords = {
@@ -325,52 +371,133 @@ def enhance_article_with_metadata(article: Dict, content: str) -> Dict:
         'business-owners': ['business', 'entrepreneur', 'strategy', 'office', 'meeting']
     }
 
-    keyword = random.choice(image_keywords.get(article['category'], ['technology']))
-    article_copy['featured_image'] = f'https://images.unsplash.com/photo-{random.randint(1500000000, 1700000000)}?auto=format&fit=crop&w=1200&h=630&q={keyword}'
+    keyword = rng.choice(image_keywords.get(record.category, ['technology']))
+    record.featured_image = f'https://images.unsplash.com/photo-{rng.randint(1500000000, 1700000000)}?auto=format&fit=crop&w=1200&h=630&q={keyword}'
 
     # Generate tags
     all_tags = ['AI', 'Technology', 'Innovation', 'Future', 'Learning', 'Digital Transformation',
                 'Machine Learning', 'Automation', 'Productivity', 'Education']
-    article_copy['tags'] = random.sample(all_tags, random.randint(3, 5))
+    record.tags = rng.sample(all_tags, rng.randint(3, 5))
+
+    # Reading time from the real word count; the manifest value is only a target
+    document = parse_document(content, newline=CORPUS_NEWLINE)
+    record.reading_time = document.reading_time
 
     # Enhanced excerpt
-    first_para = content.split('\\n\\n')[0]
+    first_para = document.first_paragraph
     if len(first_para) > 200:
-        article_copy['excerpt'] = first_para[:197] + '...'
+        record.excerpt = first_para[:197] + '...'
     else:
-        article_copy['excerpt'] = first_para
+        record.excerpt = first_para
 
     # SEO keywords
-    title_words = article['title'].lower().split()
-    article_copy['seo_keywords'] = ', '.join([
-        article['title'],
-        ', '.join(article_copy['tags']),
-        article['audience']
+    record.seo_keywords = ', '.join([
+        record.title,
+        ', '.join(record.tags),
+        record.audience
     ])
 
-    return article_copy
-
-if __name__ == '__main__':
-    # Load manifest
-    with open('/home/vik/aiborg_CC/aiborg-learn-sphere/scripts/article_manifest.json', 'r') as f:
-        articles = json.load(f)
-
-    print(f"Generating content for {len(articles)} articles...")
-    print("This will take a few minutes...\n")
-
-    # Generate content for all articles
-    enhanced_articles = []
-    for i, article in enumerate(articles, 1):
-        if i % 50 == 0:
-            print(f"  Progress: {i}/{len(articles)} articles...")
+    return record
+
+def generate_article(article: ArticleRecord) -> ArticleRecord:
+    """Generate content and metadata for one article using its own seeded RNG"""
+    with METRICS.time('article_generate_seconds'):
+        rng = article_rng(article)
+        content = generate_article_content(article, rng)
+        enhanced = enhance_article_with_metadata(article, content, rng)
+    METRICS.inc('articles_generated_total')
+    return enhanced
+
+def _generate_chunk(records: List[ArticleRecord]) -> Tuple[List[ArticleRecord], Dict]:
+    """Pool task: generate a chunk and hand this worker's metrics back to the parent"""
+    return [generate_article(record) for record in records], METRICS.drain()
+
+def generator_fingerprint() -> str:
+    """Hash of the template set and generator version, part of every cache key"""
+    templates = [YOUNG_LEARNERS_TEMPLATES, TEENAGERS_TEMPLATES, PROFESSIONALS_TEMPLATES, BUSINESS_OWNERS_TEMPLATES]
+    payload = json.dumps([GENERATOR_VERSION, templates], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def generate_corpus(articles: Iterable[Dict], workers: int = 1, chunk_size: int = 64,
+                    cache: Optional[ContentCache] = None) -> Iterator[Dict]:
+    """Generate content for a stream of manifest records, in input order
+
+    Articles are processed a window at a time so memory stays bounded. Cached
+    articles are served from disk; the rest are generated in-process or, with
+    workers > 1, fanned out over a process pool. Each article is seeded from
+    its slug, so the output is identical for any worker count or cache state.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    count = 0
+    try:
+        for window in iter_batches(articles, max(workers, 1) * chunk_size * 4):
+            for article in _generate_window(window, pool, chunk_size, cache):
+                count += 1
+                if count % 50 == 0:
+                    print(f"  Progress: {count} articles...", file=sys.stderr)
+                yield article
+    finally:
+        if pool:
+            pool.shutdown()
+
+def _generate_window(window: List[Dict], pool: Optional[ProcessPoolExecutor], chunk_size: int,
+                     cache: Optional[ContentCache]) -> List[Dict]:
+    """Generate one window of articles, serving cache hits and merging results in order"""
+    results = [None] * len(window)
+    keys = [None] * len(window)
+    misses = []
+
+    for i, record in enumerate(window):
+        if cache:
+            keys[i] = cache.key(record)
+            cached = cache.get(keys[i])
+            if cached is not None:
+                results[i] = cached
+                METRICS.inc('cache_hits_total')
+                continue
+            METRICS.inc('cache_misses_total')
+        misses.append(i)
+
+    records = [window[i] for i in misses]
+    if pool:
+        generated = []
+        for articles, worker_metrics in pool.map(_generate_chunk, iter_batches(records, chunk_size)):
+            generated.extend(articles)
+            METRICS.merge(worker_metrics)
+    else:
+        generated = map(generate_article, records)
 
-        content = generate_article_content(article)
-        enhanced_article = enhance_article_with_metadata(article, content)
-        enhanced_articles.append(enhanced_article)
+    for i, article in zip(misses, generated):
+        results[i] = article
+        if cache:
+            cache.put(keys[i], article)
 
-    # Save enhanced manifest
-    with open('/home/vik/aiborg_CC/aiborg-learn-sphere/scripts/articles_with_content.json', 'w') as f:
-        json.dump(enhanced_articles, f, indent=2)
+    return results
 
-    print(f"\n✅ Successfully generated content for {len(enhanced_articles)} articles!")
-    print(f"   Enhanced manifest saved to: scripts/articles_with_content.json")
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate article content from the manifest')
+    parser.add_argument('--input', default=MANIFEST_FILE, help="Manifest path, or '-' for stdin")
+    parser.add_argument('--output', default=CONTENT_FILE, help="Output path, or '-' for stdout")
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes (default: 1)')
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help='Build cache directory (default: scripts/.content_cache)')
+    parser.add_argument('--cache-max-mb', type=int, default=512, help='Build cache size limit in MB (default: 512)')
+    parser.add_argument('--no-cache', action='store_true', help='Regenerate every article')
+    metrics.add_metrics_argument(parser)
+    args = parser.parse_args()
+
+    metrics.enable('content', args.metrics_dir)
+
+    cache = None
+    if not args.no_cache:
+        cache = ContentCache(args.cache_dir, generator_fingerprint(), args.cache_max_mb * 1024 * 1024)
+
+    print("Generating content for all articles...", file=sys.stderr)
+    print("This will take a few minutes...\n", file=sys.stderr)
+
+    manifest = (ArticleRecord.from_dict(record) for record in read_records(args.input))
+    count = write_records(args.output, generate_corpus(manifest, args.workers, cache=cache))
+
+    print(f"\n✅ Successfully generated content for {count} articles!", file=sys.stderr)
+    print(f"   Enhanced corpus saved to: {args.output}", file=sys.stderr)
+    if cache:
+        print(f"   Build cache: {cache.summary()}", file=sys.stderr)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Corpus I/O for the Blog Article Pipeline
+Reads and writes articles as line-delimited JSON (one record per line) so every
+stage streams in constant memory and stages can be chained with pipes:
+
+    python generate_blog_articles.py --output - \\
+        | python content_generator.py --input - --output - \\
+        | python generate_sql_scripts.py --input -
+"""
+
+import json
+import os
+import sys
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from article_record import record_to_json
+from metrics import METRICS
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MANIFEST_FILE = os.path.join(SCRIPTS_DIR, 'article_manifest.ndjson')
+CONTENT_FILE = os.path.join(SCRIPTS_DIR, 'articles_with_content.ndjson')
+
+STDIO_PATH = '-'
+
+# Line separator inside generated article bodies: content_generator joins lines
+# with a literal backslash-n, not a newline character
+CORPUS_NEWLINE = '\\n'
+
+def read_records(path: str) -> Iterator[Dict]:
+    """Yield article records from an NDJSON file ('-' for stdin)
+
+    Legacy pretty-printed JSON arrays (*.json) are still accepted, but are
+    loaded whole.
+    """
+    if path == STDIO_PATH:
+        for line in sys.stdin:
+            if line.strip():
+                yield json.loads(line)
+        return
+
+    if path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from json.load(f)
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def write_records(path: str, records: Iterable[Dict]) -> int:
+    """Write article records as NDJSON ('-' for stdout), returns the count written"""
+    count = 0
+    if path == STDIO_PATH:
+        emitted = 0
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False, default=record_to_json) + '\n'
+            sys.stdout.write(line)
+            emitted += len(line.encode('utf-8'))
+            count += 1
+        sys.stdout.flush()
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, default=record_to_json) + '\n')
+                count += 1
+        emitted = os.path.getsize(path)
+
+    METRICS.inc('records_written_total', count)
+    METRICS.inc('bytes_emitted_total', emitted)
+    return count
+
+def iter_batches(records: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    """Group a record stream into lists of at most batch_size records"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def iter_budget_batches(records: Iterable[Dict], size_of: Callable[[Dict], int], max_bytes: int,
+                        max_records: int, key: str = 'audience') -> Iterator[List[Dict]]:
+    """Group a record stream into batches bounded by total size and record count
+
+    Records are batched separately per value of key, so every batch is
+    homogeneous; one batch per key value is kept open and yielded when the
+    next record would overflow it. A record larger than max_bytes on its own
+    gets a batch to itself.
+    """
+    open_batches = {}
+    for record in records:
+        size = size_of(record)
+        entry = open_batches.setdefault(record.get(key), [[], 0])
+        if entry[0] and (entry[1] + size > max_bytes or len(entry[0]) >= max_records):
+            yield entry[0]
+            entry[0], entry[1] = [], 0
+        entry[0].append(record)
+        entry[1] += size
+    for batch, _ in open_batches.values():
+        if batch:
+            yield batch
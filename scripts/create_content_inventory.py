@@ -1,86 +1,301 @@
 #!/usr/bin/env python3
 """
 Create Content Inventory CSV
-Generates a spreadsheet-compatible CSV of all 500 articles
+Generates a spreadsheet-compatible CSV of all 500 articles, and optionally a
+Parquet/Arrow copy plus grouped statistics for dashboards, in a single pass
 """
 
-import json
+import argparse
 import csv
+import os
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
 
-def create_content_inventory():
-    """Create CSV inventory of all articles"""
+import metrics
+from corpus_io import CONTENT_FILE, CORPUS_NEWLINE, SCRIPTS_DIR, read_records
+from document_model import WORDS_PER_MINUTE, parse_document
+from generate_sql_scripts import BATCH_INDEX_FILE
+from metrics import METRICS
 
-    # Load articles
-    with open('/home/vik/aiborg_CC/aiborg-learn-sphere/scripts/articles_with_content.json', 'r') as f:
-        articles = json.load(f)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Columnar output is optional
+    pa = None
+    pq = None
 
-    # Create CSV
-    output_file = '/home/vik/aiborg_CC/aiborg-learn-sphere/scripts/CONTENT_INVENTORY.csv'
+# (CSV header, column name) for every inventory column, in output order
+INVENTORY_COLUMNS = [
+    ('Index', 'index'),
+    ('Title', 'title'),
+    ('Slug', 'slug'),
+    ('Audience', 'audience'),
+    ('Category', 'category'),
+    ('Reading Time (min)', 'reading_time'),
+    ('Word Count', 'word_count'),
+    ('Tags', 'tags'),
+    ('Batch', 'batch'),
+    ('Meta Title', 'meta_title'),
+    ('Excerpt', 'excerpt')
+]
 
-    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = [
-            'Index',
-            'Title',
-            'Slug',
-            'Audience',
-            'Category',
-            'Reading Time (min)',
-            'Word Count (est)',
-            'Tags',
-            'Batch',
-            'Meta Title',
-            'Excerpt'
+GROUP_DIMENSIONS = ('audience', 'category', 'batch')
+
+DEFAULT_BATCH_INDEX = os.path.join(SCRIPTS_DIR, 'blog_inserts', BATCH_INDEX_FILE)
+
+# Rows buffered per Parquet row group / Arrow record batch
+ROW_GROUP_SIZE = 65536
+
+class GroupStats:
+    """Running aggregates for one group of articles"""
+
+    __slots__ = ('articles', 'reading_time', 'words', 'min_reading_time', 'max_reading_time')
+
+    def __init__(self):
+        self.articles = 0
+        self.reading_time = 0
+        self.words = 0
+        self.min_reading_time = None
+        self.max_reading_time = None
+
+    def add(self, reading_time: int, words: int):
+        self.articles += 1
+        self.reading_time += reading_time
+        self.words += words
+        if self.min_reading_time is None or reading_time < self.min_reading_time:
+            self.min_reading_time = reading_time
+        if self.max_reading_time is None or reading_time > self.max_reading_time:
+            self.max_reading_time = reading_time
+
+    @property
+    def avg_reading_time(self) -> float:
+        return self.reading_time / self.articles if self.articles else 0.0
+
+def read_batch_index(path: str) -> array:
+    """Batch number per corpus position, from generate_sql_scripts.py's batch index (0 = not batched)"""
+    batches = array('I')
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            position, batch = map(int, line.split('\t'))
+            if position > len(batches):
+                batches.extend([0] * (position - len(batches)))
+            batches[position - 1] = batch
+    return batches
+
+class InventoryEngine:
+    """Builds inventory rows and every aggregate in one pass over the corpus"""
+
+    def __init__(self, batches: Optional[array] = None):
+        self.batches = batches if batches is not None else array('I')
+        self.overall = GroupStats()
+        self.groups: Dict[str, Dict[str, GroupStats]] = {dimension: {} for dimension in GROUP_DIMENSIONS}
+
+    def rows(self, articles: Iterable[Dict]) -> Iterator[Dict]:
+        """Yield one inventory row (keyed by column name) per article"""
+        batches = self.batches
+        for i, article in enumerate(articles, 1):
+            batch = batches[i - 1] if i <= len(batches) else 0
+
+            # Real word count and reading time from the body; manifests without
+            # content fall back to estimating words from the reading time
+            content = article.get('content')
+            if content:
+                document = parse_document(content, newline=CORPUS_NEWLINE)
+                word_count = document.word_count
+                reading_time = document.reading_time
+            else:
+                reading_time = article.get('reading_time', 5)
+                word_count = reading_time * WORDS_PER_MINUTE
+
+            row = {
+                'index': i,
+                'title': article.get('title', ''),
+                'slug': article.get('slug', ''),
+                'audience': article.get('audience', ''),
+                'category': article.get('category', ''),
+                'reading_time': reading_time,
+                'word_count': word_count,
+                'tags': list(article.get('tags', [])),
+                'batch': f'Batch {batch:02d}' if batch else '',
+                'meta_title': article.get('meta_title', '')[:80],
+                'excerpt': article.get('excerpt', '')[:100]
+            }
+
+            self.overall.add(reading_time, word_count)
+            for dimension in GROUP_DIMENSIONS:
+                key = row[dimension] or 'Unknown'
+                stats = self.groups[dimension].get(key)
+                if stats is None:
+                    stats = self.groups[dimension][key] = GroupStats()
+                stats.add(reading_time, word_count)
+
+            yield row
+
+    def group_rows(self) -> List[Dict]:
+        """Grouped statistics as flat rows: one per (dimension, key)"""
+        return [
+            {
+                'dimension': dimension,
+                'key': key,
+                'articles': stats.articles,
+                'total_words': stats.words,
+                'avg_reading_time': round(stats.avg_reading_time, 2),
+                'min_reading_time': stats.min_reading_time,
+                'max_reading_time': stats.max_reading_time
+            }
+            for dimension in GROUP_DIMENSIONS
+            for key, stats in sorted(self.groups[dimension].items())
         ]
 
+def inventory_schema():
+    return pa.schema([
+        ('index', pa.int64()),
+        ('title', pa.string()),
+        ('slug', pa.string()),
+        ('audience', pa.string()),
+        ('category', pa.string()),
+        ('reading_time', pa.int32()),
+        ('word_count', pa.int32()),
+        ('tags', pa.list_(pa.string())),
+        ('batch', pa.string()),
+        ('meta_title', pa.string()),
+        ('excerpt', pa.string())
+    ])
+
+def group_schema():
+    return pa.schema([
+        ('dimension', pa.string()),
+        ('key', pa.string()),
+        ('articles', pa.int64()),
+        ('total_words', pa.int64()),
+        ('avg_reading_time', pa.float64()),
+        ('min_reading_time', pa.int32()),
+        ('max_reading_time', pa.int32())
+    ])
+
+def open_columnar_writer(path: str, schema):
+    """Parquet writer, or an Arrow IPC file writer for .arrow/.feather paths"""
+    if path.endswith(('.arrow', '.feather')):
+        return pa.ipc.new_file(path, schema)
+    return pq.ParquetWriter(path, schema)
+
+def group_stats_path(path: str) -> str:
+    """CONTENT_INVENTORY.parquet -> CONTENT_INVENTORY_groups.parquet"""
+    root, ext = os.path.splitext(path)
+    return f'{root}_groups{ext}'
+
+class ColumnarSink:
+    """Buffers inventory rows as columns and writes them a row group at a time"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.schema = inventory_schema()
+        self.writer = open_columnar_writer(path, self.schema)
+        self.columns = {name: [] for name in self.schema.names}
+        self.buffered = 0
+
+    def write(self, row: Dict):
+        for name, values in self.columns.items():
+            values.append(row[name])
+        self.buffered += 1
+        if self.buffered >= ROW_GROUP_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self.buffered:
+            return
+        self.writer.write_table(pa.Table.from_pydict(self.columns, schema=self.schema))
+        for values in self.columns.values():
+            values.clear()
+        self.buffered = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+def write_group_stats(path: str, group_rows: List[Dict]):
+    schema = group_schema()
+    columns = {name: [row[name] for row in group_rows] for name in schema.names}
+    writer = open_columnar_writer(path, schema)
+    writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+    writer.close()
+
+def create_content_inventory(input_file: str = CONTENT_FILE,
+                             output_file: str = os.path.join(SCRIPTS_DIR, 'CONTENT_INVENTORY.csv'),
+                             columnar_file: Optional[str] = None, batch_index: Optional[str] = DEFAULT_BATCH_INDEX):
+    """Create CSV inventory of all articles (plus a columnar copy if columnar_file is set)
+
+    The Batch column comes from the batch index generate_sql_scripts.py wrote
+    for the same corpus; it is left empty when there is none.
+    """
+
+    if columnar_file and pa is None:
+        raise SystemExit("❌ Parquet/Arrow output requires pyarrow (pip install pyarrow)")
+
+    batches = read_batch_index(batch_index) if batch_index and os.path.exists(batch_index) else None
+    engine = InventoryEngine(batches)
+    sink = ColumnarSink(columnar_file) if columnar_file else None
+
+    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
+        fieldnames = [header for header, _ in INVENTORY_COLUMNS]
+
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
 
-        for i, article in enumerate(articles, 1):
-            # Calculate batch number
-            batch_num = ((i - 1) // 50) + 1
-
-            # Estimate word count from reading time
-            word_count = article.get('reading_time', 5) * 200
-
-            # Get tags as comma-separated string
-            tags = ', '.join(article.get('tags', []))
-
-            writer.writerow({
-                'Index': i,
-                'Title': article.get('title', ''),
-                'Slug': article.get('slug', ''),
-                'Audience': article.get('audience', ''),
-                'Category': article.get('category', ''),
-                'Reading Time (min)': article.get('reading_time', 5),
-                'Word Count (est)': word_count,
-                'Tags': tags,
-                'Batch': f'Batch {batch_num:02d}',
-                'Meta Title': article.get('meta_title', '')[:80],
-                'Excerpt': article.get('excerpt', '')[:100]
-            })
+        for row in engine.rows(read_records(input_file)):
+            csv_row = {header: row[column] for header, column in INVENTORY_COLUMNS}
+            csv_row['Tags'] = ', '.join(row['tags'])
+            writer.writerow(csv_row)
+            if sink:
+                sink.write(row)
+
+    total_articles = engine.overall.articles
+    METRICS.inc('articles_inventoried_total', total_articles)
+    METRICS.inc('bytes_emitted_total', os.path.getsize(output_file))
 
     print(f"✅ Content inventory created: {output_file}")
-    print(f"   Total articles: {len(articles)}")
+    print(f"   Total articles: {total_articles}")
     print(f"   Columns: {len(fieldnames)}")
+    if batches is None:
+        print(f"⚠️  No batch index at {batch_index}; run generate_sql_scripts.py first to fill the Batch column")
+    elif len(batches) != total_articles:
+        print(f"⚠️  Batch index covers {len(batches)} articles, not {total_articles}; regenerate the SQL batches")
 
-    # Print summary statistics
-    audiences = {}
-    for article in articles:
-        aud = article.get('audience', 'Unknown')
-        audiences[aud] = audiences.get(aud, 0) + 1
+    if sink:
+        sink.close()
+        groups_file = group_stats_path(columnar_file)
+        write_group_stats(groups_file, engine.group_rows())
+        METRICS.inc('bytes_emitted_total', os.path.getsize(columnar_file) + os.path.getsize(groups_file))
+        print(f"✅ Columnar inventory: {columnar_file}")
+        print(f"   Grouped statistics: {groups_file}")
 
-    print("\n📊 Distribution by Audience:")
-    for audience, count in sorted(audiences.items()):
-        print(f"   {audience}: {count} articles")
+    if not total_articles:
+        return
 
-    total_words = sum(article.get('reading_time', 5) * 200 for article in articles)
-    avg_reading_time = sum(article.get('reading_time', 5) for article in articles) / len(articles)
+    print("\n📊 Distribution by Audience:")
+    for audience, stats in sorted(engine.groups['audience'].items()):
+        print(f"   {audience}: {stats.articles} articles")
 
     print(f"\n📈 Content Statistics:")
-    print(f"   Estimated total words: {total_words:,}")
-    print(f"   Average reading time: {avg_reading_time:.1f} minutes")
-    print(f"   Shortest article: {min(article.get('reading_time', 5) for article in articles)} min")
-    print(f"   Longest article: {max(article.get('reading_time', 5) for article in articles)} min")
+    print(f"   Total words: {engine.overall.words:,}")
+    print(f"   Average reading time: {engine.overall.avg_reading_time:.1f} minutes")
+    print(f"   Shortest article: {engine.overall.min_reading_time} min")
+    print(f"   Longest article: {engine.overall.max_reading_time} min")
 
 if __name__ == '__main__':
-    create_content_inventory()
+    parser = argparse.ArgumentParser(description='Create the content inventory CSV')
+    parser.add_argument('--input', default=CONTENT_FILE, help="Article corpus (NDJSON), or '-' for stdin")
+    parser.add_argument('--output', default=os.path.join(SCRIPTS_DIR, 'CONTENT_INVENTORY.csv'),
+                        help='CSV path (default: scripts/CONTENT_INVENTORY.csv)')
+    parser.add_argument('--columnar', metavar='PATH',
+                        help='Also write a .parquet (or .arrow) inventory and <name>_groups.<ext> '
+                             'statistics per audience, category and batch (requires pyarrow)')
+    parser.add_argument('--batch-index', default=DEFAULT_BATCH_INDEX,
+                        help=f'Batch index written by generate_sql_scripts.py for this corpus '
+                             f'(default: scripts/blog_inserts/{BATCH_INDEX_FILE})')
+    metrics.add_metrics_argument(parser)
+    args = parser.parse_args()
+
+    metrics.enable('inventory', args.metrics_dir)
+
+    create_content_inventory(args.input, args.output, args.columnar, args.batch_index)
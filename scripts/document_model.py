@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Parsed Document Model for Article Bodies
+One tokenizer/markdown-structure pass per article body, shared by every
+consumer (inventory, excerpts, quality scoring, SQL metadata) and cached so
+the same body is never scanned twice
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+WORDS_PER_MINUTE = 200
+
+# Excerpts come from the first non-heading paragraph longer than this
+EXCERPT_MIN_PARAGRAPH = 100
+
+class ParsedDocument:
+    """Structure and statistics of one markdown article body"""
+
+    __slots__ = ('text', 'newline', 'word_count', 'heading_count',
+                 'paragraph_offsets', 'first_qualifying_paragraph')
+
+    def __init__(self, text: str, newline: str, word_count: int, heading_count: int,
+                 paragraph_offsets: Tuple[Tuple[int, int], ...],
+                 first_qualifying_paragraph: Optional[str]):
+        self.text = text
+        self.newline = newline
+        self.word_count = word_count
+        self.heading_count = heading_count
+        self.paragraph_offsets = paragraph_offsets
+        self.first_qualifying_paragraph = first_qualifying_paragraph
+
+    @property
+    def reading_time(self) -> int:
+        """Minutes at WORDS_PER_MINUTE, at least 1"""
+        return max(1, self.word_count // WORDS_PER_MINUTE)
+
+    @property
+    def paragraph_count(self) -> int:
+        return len(self.paragraph_offsets)
+
+    def paragraph(self, i: int) -> str:
+        start, end = self.paragraph_offsets[i]
+        return self.text[start:end]
+
+    @property
+    def first_paragraph(self) -> str:
+        return self.paragraph(0) if self.paragraph_offsets else ''
+
+@lru_cache(maxsize=64)
+def parse_document(text: str, newline: str = '\n') -> ParsedDocument:
+    """Parse an article body in a single pass over its lines
+
+    `newline` is the line separator used in the body; the content generator's
+    corpus stores it as a literal backslash-n, so pass newline='\\\\n' there.
+    Paragraphs are runs of non-blank lines; their (start, end) offsets index
+    into the original text.
+    """
+    step = len(newline)
+
+    word_count = 0
+    heading_count = 0
+    paragraphs = []
+    first_qualifying = None
+    paragraph_start = None
+    paragraph_end = 0
+
+    offset = 0
+    for line in text.split(newline):
+        line_end = offset + len(line)
+        stripped = line.strip()
+
+        if stripped:
+            word_count += len(line.split())
+            if paragraph_start is None:
+                paragraph_start = offset
+            paragraph_end = line_end
+            if line.startswith('#'):
+                heading_count += 1
+            elif first_qualifying is None and len(line) > EXCERPT_MIN_PARAGRAPH:
+                first_qualifying = line
+        elif paragraph_start is not None:
+            paragraphs.append((paragraph_start, paragraph_end))
+            paragraph_start = None
+
+        offset = line_end + step
+
+    if paragraph_start is not None:
+        paragraphs.append((paragraph_start, paragraph_end))
+
+    return ParsedDocument(
+        text=text,
+        newline=newline,
+        word_count=word_count,
+        heading_count=heading_count,
+        paragraph_offsets=tuple(paragraphs),
+        first_qualifying_paragraph=first_qualifying
+    )
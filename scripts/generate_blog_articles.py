@@ -4,12 +4,21 @@ Blog Article Generator for Aiborg Learn Sphere
 Generates 500 AI-focused articles across different audience segments
 """
 
-import json
-import re
+import argparse
+import hashlib
+import sys
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import Iterator, List, Optional, Tuple
 import random
 
+import metrics
+from article_record import ArticleRecord
+from corpus_io import MANIFEST_FILE, write_records
+from slugs import SLUG_INDEX_FILE, SlugIndex, slugify
+
+# Slug index owners are namespaced per generator
+SLUG_OWNER = 'manifest'
+
 # Article Topics by Audience
 YOUNG_LEARNERS_TOPICS = [
     # AI Basics (20 topics)
@@ -561,17 +570,10 @@ BUSINESS_OWNERS_TOPICS = [
     "Profitability Analysis AI"
 ]
 
-def generate_slug(title: str) -> str:
-    """Generate URL-friendly slug from title"""
-    slug = title.lower()
-    slug = re.sub(r'[^a-z0-9\s-]', '', slug)
-    slug = re.sub(r'\s+', '-', slug)
-    slug = re.sub(r'-+', '-', slug)
-    return slug.strip('-')
-
-def create_article_template(title: str, category: str, audience: str, index: int, days_ago: int) -> Dict:
+def create_article_template(title: str, category: str, audience: str, index: int, days_ago: int,
+                            slug: Optional[str] = None) -> ArticleRecord:
     """Create article template with metadata"""
-    slug = generate_slug(title)
+    slug = slug or slugify(title)
 
     # Map categories to category slugs
     category_map = {
@@ -584,73 +586,98 @@ def create_article_template(title: str, category: str, audience: str, index: int
     # Generate excerpt from title
     excerpt = f"Discover {title.lower()}. Essential insights for {audience.lower()}."
 
-    # Reading time based on audience
+    # Reading time based on audience, seeded from the slug so the manifest is
+    # reproducible and unchanged topics keep their build-cache entries
     reading_times = {
-        'Young Learners': random.randint(2, 4),
-        'Teenagers': random.randint(3, 6),
-        'Professionals': random.randint(5, 10),
-        'Business Owners': random.randint(7, 12)
+        'Young Learners': (2, 4),
+        'Teenagers': (3, 6),
+        'Professionals': (5, 10),
+        'Business Owners': (7, 12)
     }
-
-    return {
-        'title': title,
-        'slug': slug,
-        'category': category_map[category],
-        'audience': audience,
-        'excerpt': excerpt[:200],
-        'reading_time': reading_times[audience],
-        'days_ago': days_ago,
-        'index': index,
-        'meta_title': title[:160],
-        'meta_description': excerpt[:320]
-    }
-
-def generate_article_manifest():
-    """Generate manifest of all 500 articles"""
-    articles = []
-    index = 1
-
-    # Young Learners - 100 articles
-    for i, topic in enumerate(YOUNG_LEARNERS_TOPICS):
-        articles.append(create_article_template(
-            topic, 'Young Learners', 'Young Learners', index, 500 - index
-        ))
-        index += 1
-
-    # Teenagers - 100 articles
-    for i, topic in enumerate(TEENAGERS_TOPICS):
-        articles.append(create_article_template(
-            topic, 'Teenagers', 'Teenagers', index, 500 - index
-        ))
-        index += 1
-
-    # Professionals - 150 articles
-    for i, topic in enumerate(PROFESSIONALS_TOPICS):
-        articles.append(create_article_template(
-            topic, 'Professionals', 'Professionals', index, 500 - index
-        ))
-        index += 1
-
-    # Business Owners - 150 articles
-    for i, topic in enumerate(BUSINESS_OWNERS_TOPICS):
-        articles.append(create_article_template(
-            topic, 'Business Owners', 'Business Owners', index, 500 - index
-        ))
-        index += 1
-
-    return articles
+    rng = random.Random(int.from_bytes(hashlib.sha256(slug.encode('utf-8')).digest()[:8], 'big'))
+
+    return ArticleRecord(
+        title=title,
+        slug=slug,
+        category=category_map[category],
+        audience=audience,
+        excerpt=excerpt[:200],
+        reading_time=rng.randint(*reading_times[audience]),
+        days_ago=days_ago,
+        index=index,
+        meta_title=title[:160],
+        meta_description=excerpt[:320]
+    )
+
+def manifest_topics() -> List[Tuple[str, str]]:
+    """(title, audience) for all 500 articles, in manifest order"""
+    return (
+        # Young Learners - 100 articles
+        [(topic, 'Young Learners') for topic in YOUNG_LEARNERS_TOPICS] +
+        # Teenagers - 100 articles
+        [(topic, 'Teenagers') for topic in TEENAGERS_TOPICS] +
+        # Professionals - 150 articles
+        [(topic, 'Professionals') for topic in PROFESSIONALS_TOPICS] +
+        # Business Owners - 150 articles
+        [(topic, 'Business Owners') for topic in BUSINESS_OWNERS_TOPICS]
+    )
+
+def synthetic_topics(count: int) -> List[Tuple[str, str]]:
+    """(title, audience) for a manifest of any size, cycling the topic lists (for benchmarking)
+
+    Repeated topics get a part suffix so titles stay unique; every block of 500
+    keeps the audience mix of the real manifest.
+    """
+    topics = manifest_topics()
+    titled = []
+    for i in range(count):
+        topic, audience = topics[i % len(topics)]
+        part = i // len(topics)
+        titled.append((topic if part == 0 else f'{topic} (Part {part + 1})', audience))
+    return titled
+
+def build_manifest(topics: List[Tuple[str, str]], slug_index: SlugIndex) -> Iterator[ArticleRecord]:
+    """Issue every slug in one bulk pass, then yield the records one at a time"""
+    titles = [title for title, _ in topics]
+    slugs = slug_index.issue_bulk(titles, owners=[f'{SLUG_OWNER}:{audience}:{title}' for title, audience in topics])
+
+    total = len(topics)
+    for index, ((title, audience), slug) in enumerate(zip(topics, slugs), 1):
+        yield create_article_template(title, audience, audience, index, total - index, slug)
+
+def generate_article_manifest(slug_index: Optional[SlugIndex] = None) -> Iterator[ArticleRecord]:
+    """Generate manifest of all 500 articles, one record at a time"""
+    return build_manifest(manifest_topics(), slug_index or SlugIndex())
+
+def generate_synthetic_manifest(count: int, slug_index: Optional[SlugIndex] = None) -> Iterator[ArticleRecord]:
+    """Generate a manifest of any size by cycling the topic lists (for benchmarking)"""
+    return build_manifest(synthetic_topics(count), slug_index or SlugIndex())
 
 if __name__ == '__main__':
-    print("Generating article manifest...")
-    articles = generate_article_manifest()
-
-    # Save manifest
-    with open('/home/vik/aiborg_CC/aiborg-learn-sphere/scripts/article_manifest.json', 'w') as f:
-        json.dump(articles, f, indent=2)
-
-    print(f"✅ Generated manifest for {len(articles)} articles")
-    print(f"   - Young Learners: {len(YOUNG_LEARNERS_TOPICS)}")
-    print(f"   - Teenagers: {len(TEENAGERS_TOPICS)}")
-    print(f"   - Professionals: {len(PROFESSIONALS_TOPICS)}")
-    print(f"   - Business Owners: {len(BUSINESS_OWNERS_TOPICS)}")
-    print(f"\nManifest saved to: scripts/article_manifest.json")
+    parser = argparse.ArgumentParser(description='Generate the article manifest as NDJSON')
+    parser.add_argument('--output', default=MANIFEST_FILE, help="Manifest path, or '-' for stdout")
+    parser.add_argument('--count', type=int, help='Synthesize a manifest of this many articles from the topic lists')
+    parser.add_argument('--slug-index', help='Persistent slug index (default: scripts/slug_index.tsv; '
+                                             'synthetic manifests use an in-memory index unless this is set)')
+    metrics.add_metrics_argument(parser)
+    args = parser.parse_args()
+
+    metrics.enable('manifest', args.metrics_dir)
+
+    slug_index = SlugIndex(args.slug_index or (None if args.count else SLUG_INDEX_FILE))
+
+    print("Generating article manifest...", file=sys.stderr)
+    if args.count:
+        count = write_records(args.output, generate_synthetic_manifest(args.count, slug_index))
+    else:
+        count = write_records(args.output, generate_article_manifest(slug_index))
+    slug_index.save()
+
+    print(f"✅ Generated manifest for {count} articles", file=sys.stderr)
+    print(f"   - Young Learners: {len(YOUNG_LEARNERS_TOPICS)}", file=sys.stderr)
+    print(f"   - Teenagers: {len(TEENAGERS_TOPICS)}", file=sys.stderr)
+    print(f"   - Professionals: {len(PROFESSIONALS_TOPICS)}", file=sys.stderr)
+    print(f"   - Business Owners: {len(BUSINESS_OWNERS_TOPICS)}", file=sys.stderr)
+    if slug_index.collisions:
+        print(f"   ⚠️  {slug_index.collisions} duplicate slugs resolved with numeric suffixes", file=sys.stderr)
+    print(f"\nManifest saved to: {args.output}", file=sys.stderr)
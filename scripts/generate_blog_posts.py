@@ -4,23 +4,40 @@ Automated Blog Post Generator and Publisher
 Generates 500 AI-focused blog posts and publishes them to Supabase
 """
 
-import json
-import re
+import argparse
 import time
 import random
 from datetime import datetime, timedelta
 import hashlib
 import os
 
+import metrics
+from document_model import parse_document
+from metrics import METRICS
+from pacing import Pacer, make_pacer
+from quality_rules import PUBLISH_THRESHOLD, QualityEngine
+from slugs import SLUG_INDEX_FILE, SlugIndex, slugify
+from sql_literals import sql_literal
+from sql_writer import SqlWriter, add_compression_argument
+from toc_index import TocIndex
+from progress_journal import ProgressJournal
+
 # Configuration
 SUPABASE_URL = "YOUR_SUPABASE_URL"  # Will be set via environment
 SUPABASE_ANON_KEY = "YOUR_SUPABASE_ANON_KEY"  # Will be set via environment
-PROGRESS_FILE = "blog_generation_progress.json"
+PROGRESS_FILE = "blog_generation_progress.json"  # Legacy format, imported once into the journal
+PROGRESS_JOURNAL = "blog_generation_progress.jsonl"
 TOC_FILE = "../blog-posts-toc.md"
+TOC_INDEX_FILE = "blog_toc_index.json"
+SLUG_OWNER = "toc"  # Namespace for this generator's slug index entries
+SLUG_MAX_LENGTH = 100
 
 class BlogPostGenerator:
-    def __init__(self):
-        self.progress = self.load_progress()
+    def __init__(self, pacer: Pacer = None, compression: str = None):
+        self.pacer = pacer or Pacer()  # File sink: no throttling by default
+        self.compression = compression  # None, 'gzip' or 'zstd' for the batch files
+        self.progress = ProgressJournal(PROGRESS_JOURNAL, legacy_path=PROGRESS_FILE)
+        self.quality = QualityEngine()
         self.articles = []
         self.categories = {
             'young-learners': 'caf90d05-3b5f-4c8e-9876-1234567890ab',
@@ -31,82 +48,27 @@ class BlogPostGenerator:
         self.start_time = time.time()
         self.last_status_time = time.time()
 
-    def load_progress(self):
-        """Load progress from file if it exists"""
-        if os.path.exists(PROGRESS_FILE):
-            with open(PROGRESS_FILE, 'r') as f:
-                return json.load(f)
-        return {
-            'completed': [],
-            'current_index': 0,
-            'total_published': 0
-        }
-
-    def save_progress(self):
-        """Save current progress to file"""
-        with open(PROGRESS_FILE, 'w') as f:
-            json.dump(self.progress, f, indent=2)
-
     def parse_toc(self):
-        """Parse the TOC markdown file to extract all article titles"""
-        with open(TOC_FILE, 'r') as f:
-            content = f.read()
-
-        # Extract all numbered titles with their categories
-        articles = []
-        current_category = None
-        current_audience = None
-
-        for line in content.split('\n'):
-            # Check for audience sections
-            if '## Section 1: Young Learners' in line:
-                current_audience = 'young-learners'
-            elif '## Section 2: Teenagers' in line:
-                current_audience = 'teenagers'
-            elif '## Section 3: Professionals' in line:
-                current_audience = 'professionals'
-            elif '## Section 4: SMEs' in line:
-                current_audience = 'business-owners'
-
-            # Check for subsection headers
-            if line.startswith('### '):
-                current_category = line.replace('###', '').strip()
-
-            # Extract numbered articles
-            match = re.match(r'^(\d+)\.\s+\*\*(.*?)\*\*.*?$', line)
-            if match:
-                number = int(match.group(1))
-                title = match.group(2).strip()
-
-                # Extract subtitle if present
-                subtitle_match = re.match(r'(.*?):\s+(.*)', title)
-                if subtitle_match:
-                    main_title = subtitle_match.group(1)
-                    subtitle = subtitle_match.group(2)
-                else:
-                    main_title = title
-                    subtitle = None
-
-                articles.append({
-                    'number': number,
-                    'title': title,
-                    'main_title': main_title,
-                    'subtitle': subtitle,
-                    'audience': current_audience,
-                    'category': current_category,
-                    'slug': self.generate_slug(title)
-                })
-
-        self.articles = articles
-        print(f"Parsed {len(articles)} articles from TOC")
-        return articles
+        """Load all article titles from the TOC, via the persisted TOC index"""
+        index = TocIndex(TOC_FILE, TOC_INDEX_FILE, self.generate_slug)
+        self.articles = index.load()
+
+        # Final slugs come from the shared slug index, so they can't collide
+        # with each other or with slugs issued by the other generators
+        slug_index = SlugIndex(SLUG_INDEX_FILE)
+        for article in self.articles:
+            owner = f"{SLUG_OWNER}:{article['audience']}:{article['title']}"
+            article['slug'] = slug_index.issue(article['slug'], owner, SLUG_MAX_LENGTH)
+        slug_index.save()
+
+        print(f"Parsed {len(self.articles)} articles from TOC ({index.summary()})")
+        if slug_index.collisions:
+            print(f"⚠️  {slug_index.collisions} duplicate slugs resolved with numeric suffixes")
+        return self.articles
 
     def generate_slug(self, title):
         """Generate URL-friendly slug from title"""
-        # Remove special characters and convert to lowercase
-        slug = re.sub(r'[^\w\s-]', '', title.lower())
-        slug = re.sub(r'[-\s]+', '-', slug)
-        return slug[:100]  # Limit length
+        return slugify(title, SLUG_MAX_LENGTH)
 
     def generate_article_content(self, article):
         """Generate a 500-word article based on the title and audience"""
@@ -412,45 +374,19 @@ The businesses that will thrive aren't waiting for AI to be perfect—they're us
 """
         return content.strip()
 
-    def evaluate_article_quality(self, article, content):
-        """Evaluate if article will generate traction"""
-        quality_score = 100
-
-        # Check for key engagement factors
-        if len(content) < 400:
-            quality_score -= 20  # Too short
-
-        if not any(word in content.lower() for word in ['you', 'your', "you're", "you've"]):
-            quality_score -= 15  # Not engaging enough
-
-        if not any(char in content for char in ['?', '!']):
-            quality_score -= 10  # Lacks conversational elements
-
-        # Check for actionable content
-        if 'how' not in content.lower() and 'why' not in content.lower():
-            quality_score -= 10
-
-        # Check for sections/structure
-        if content.count('##') < 3:
-            quality_score -= 10  # Poor structure
-
-        return quality_score
-
     def generate_excerpt(self, content):
         """Generate an excerpt from the content"""
         # Get first paragraph after the intro
-        lines = content.split('\n')
-        for line in lines:
-            if len(line) > 100 and not line.startswith('#'):
-                return line[:200] + '...'
+        paragraph = parse_document(content).first_qualifying_paragraph
+        if paragraph is not None:
+            return paragraph[:200] + '...'
         return content[:200] + '...'
 
     def generate_sql_insert(self, article, content):
         """Generate SQL insert statement for the article"""
         # Generate metadata
         excerpt = self.generate_excerpt(content)
-        word_count = len(content.split())
-        reading_time = max(1, word_count // 200)  # Average reading speed
+        reading_time = parse_document(content).reading_time
 
         # Get category ID (using placeholder UUIDs)
         category_map = {
@@ -487,17 +423,17 @@ INSERT INTO blog_posts (
     created_at,
     updated_at
 ) VALUES (
-    '{article["title"].replace("'", "''")}',
-    '{article["slug"]}',
-    '{content.replace("'", "''")}',
-    '{excerpt.replace("'", "''")}',
+    {sql_literal(article["title"])},
+    {sql_literal(article["slug"])},
+    {sql_literal(content)},
+    {sql_literal(excerpt)},
     '{category_id}',
     '00000000-0000-0000-0000-000000000000',
     'published',
     {random.choice(['true', 'false'])},
     '{published_date}',
-    '{article["title"].replace("'", "''")}',
-    '{excerpt.replace("'", "''")}',
+    {sql_literal(article["title"])},
+    {sql_literal(excerpt)},
     '{featured_image}',
     {reading_time},
     NOW(),
@@ -516,7 +452,7 @@ INSERT INTO blog_posts (
         elapsed = current_time - self.start_time
         elapsed_str = time.strftime('%H:%M:%S', time.gmtime(elapsed))
 
-        completed = len(self.progress['completed'])
+        completed = len(self.progress.completed)
         total = len(self.articles)
         percent = (completed / total * 100) if total > 0 else 0
 
@@ -534,9 +470,9 @@ INSERT INTO blog_posts (
 ========================================
 ⏱️  Elapsed Time: {elapsed_str}
 📝 Articles Completed: {completed}/{total} ({percent:.1f}%)
-✅ Published Successfully: {self.progress['total_published']}
-🎯 Current Article: {self.articles[self.progress['current_index']]['title'] if self.progress['current_index'] < total else 'Complete'}
-📁 Current Category: {self.articles[self.progress['current_index']]['audience'] if self.progress['current_index'] < total else 'Complete'}
+✅ Published Successfully: {self.progress.total_published}
+🎯 Current Article: {self.articles[self.progress.current_index]['title'] if self.progress.current_index < total else 'Complete'}
+📁 Current Category: {self.articles[self.progress.current_index]['audience'] if self.progress.current_index < total else 'Complete'}
 ⏳ Estimated Time Remaining: {remaining_str}
 ========================================
         """)
@@ -553,75 +489,93 @@ INSERT INTO blog_posts (
 
         batch_size = 10
         batch_count = 0
-        batch_sql = []
+        batch_statements = 0
+        writer = None  # Open batch file; statements stream into it as they are approved
 
         # Process articles
-        for i in range(self.progress['current_index'], len(self.articles)):
+        for i in range(self.progress.current_index, len(self.articles)):
             article = self.articles[i]
 
-            # Skip if already completed
-            if article['slug'] in self.progress['completed']:
+            # Skip if already completed (set lookup)
+            if article['slug'] in self.progress.completed:
                 continue
 
+            # Wait only if the sink has asked us to slow down
+            self.pacer.acquire()
+
             print(f"\n📝 Generating article {i+1}/{len(self.articles)}: {article['title']}")
 
             # Generate content
             content = self.generate_article_content(article)
 
             # Evaluate quality
-            quality_score = self.evaluate_article_quality(article, content)
+            with METRICS.time('quality_score_seconds'):
+                quality = self.quality.score(content)
+            quality_score = quality.score
 
-            if quality_score >= 80:
+            if quality_score >= PUBLISH_THRESHOLD:
                 print(f"✅ Quality Score: {quality_score}/100 - Approved for publishing")
 
                 # Generate SQL
-                sql = self.generate_sql_insert(article, content)
-                batch_sql.append(sql)
-
-                # Mark as completed
-                self.progress['completed'].append(article['slug'])
-                self.progress['total_published'] += 1
+                with METRICS.time('sql_render_seconds'):
+                    sql = self.generate_sql_insert(article, content)
+                if writer is None:
+                    batch_count += 1
+                    writer = SqlWriter(f"sql_inserts/batch_{batch_count:03d}.sql", self.compression)
+                writer.write(sql + '\n')
+                batch_statements += 1
+                published = True
+                METRICS.inc('articles_published_total')
             else:
-                print(f"⚠️ Quality Score: {quality_score}/100 - Skipping (needs improvement)")
+                print(f"⚠️ Quality Score: {quality_score}/100 - Skipping (needs improvement: {', '.join(quality.failed)})")
+                published = False
+                METRICS.inc('articles_rejected_total')
 
-            # Update progress
-            self.progress['current_index'] = i + 1
-            self.save_progress()
+            # Append to the progress journal
+            self.progress.record(article['slug'], i, published)
 
-            # Save batch to file
-            if len(batch_sql) >= batch_size:
-                batch_count += 1
-                batch_file = f"sql_inserts/batch_{batch_count:03d}.sql"
-                with open(batch_file, 'w') as f:
-                    f.write('\n'.join(batch_sql))
-                print(f"💾 Saved batch {batch_count} to {batch_file}")
-                batch_sql = []
+            # Close the batch file once it is full
+            if batch_statements >= batch_size:
+                writer.close()
+                self.pacer.report_latency(writer.seconds)
+                print(f"💾 Saved batch {batch_count} to {writer.path}")
+                writer = None
+                batch_statements = 0
 
             # Print status update
             self.print_status()
 
-            # Small delay to avoid overwhelming
-            time.sleep(0.5)
+        # Close the last, partial batch
+        if writer is not None:
+            writer.close()
+            print(f"💾 Saved final batch {batch_count} to {writer.path}")
 
-        # Save any remaining SQL
-        if batch_sql:
-            batch_count += 1
-            batch_file = f"sql_inserts/batch_{batch_count:03d}.sql"
-            with open(batch_file, 'w') as f:
-                f.write('\n'.join(batch_sql))
-            print(f"💾 Saved final batch {batch_count} to {batch_file}")
+        self.progress.close()
+        METRICS.inc('pacer_throttled_seconds_total', self.pacer.throttled_seconds)
 
         # Final status
         print(f"""
 ========================================
 🎉 BLOG GENERATION COMPLETE!
 ========================================
-✅ Total Articles Generated: {self.progress['total_published']}
+✅ Total Articles Generated: {self.progress.total_published}
 📁 SQL Files Created: {batch_count}
+🚦 Pacing: {self.pacer.summary()}
 ⏱️  Total Time: {time.strftime('%H:%M:%S', time.gmtime(time.time() - self.start_time))}
 ========================================
         """)
 
 if __name__ == "__main__":
-    generator = BlogPostGenerator()
+    parser = argparse.ArgumentParser(description='Generate and publish blog posts from the TOC')
+    parser.add_argument('--pace', default='none',
+                        help="Pacing: 'none' (default, file sink), 'rate:<per-second>[:<burst>]' "
+                             "or 'backpressure[:<target-write-seconds>]'")
+    add_compression_argument(parser)
+    metrics.add_metrics_argument(parser)
+    args = parser.parse_args()
+
+    metrics.enable('publish', args.metrics_dir)
+
+    generator = BlogPostGenerator(pacer=make_pacer(args.pace),
+                                  compression=None if args.compress == 'none' else args.compress)
     generator.run()
\ No newline at end of file
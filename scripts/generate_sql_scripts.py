@@ -4,27 +4,91 @@ SQL Script Generator for Blog Articles
 Creates PostgreSQL INSERT statements for all 500 articles
 """
 
-import json
+import argparse
+import hashlib
 import os
+import subprocess
+import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List
-
-def escape_sql_string(text: str) -> str:
-    """Escape string for PostgreSQL"""
-    if text is None:
-        return 'NULL'
-    # Escape single quotes
-    escaped = text.replace("'", "''")
-    # Escape backslashes
-    escaped = escaped.replace("\\", "\\\\")
-    return f"E'{escaped}'"
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import metrics
+from corpus_io import CONTENT_FILE, SCRIPTS_DIR, iter_budget_batches, read_records
+from metrics import METRICS, write_text
+from sql_literals import sql_literal, sql_text_array
+from sql_writer import COMPRESSION_SUFFIXES, DECOMPRESSORS, add_compression_argument, write_sql
+
+# Columns written by the COPY output mode, in data-file order
+BLOG_POST_COPY_COLUMNS = (
+    'id', 'title', 'slug', 'content', 'excerpt', 'category_id', 'author_id',
+    'status', 'is_featured', 'published_at', 'reading_time',
+    'meta_title', 'meta_description', 'seo_keywords',
+    'og_title', 'og_description', 'featured_image',
+    'created_at', 'updated_at'
+)
+
+# Fields covered by blog_posts.content_hash; must match the backfill in
+# supabase/migrations/20260208_add_blog_posts_content_hash.sql
+CONTENT_HASH_COLUMNS = (
+    'title', 'slug', 'content', 'excerpt', 'category_id',
+    'meta_title', 'meta_description', 'seo_keywords',
+    'og_title', 'og_description', 'featured_image'
+)
+CONTENT_HASH_INDEXES = tuple(BLOG_POST_COPY_COLUMNS.index(column) for column in CONTENT_HASH_COLUMNS)
+
+# Columns the merge rewrites on a live post whose hash changed; id, status,
+# author, featured flag and dates keep their first-published values
+MERGE_UPDATE_COLUMNS = (
+    'title', 'content', 'excerpt', 'category_id', 'reading_time',
+    'meta_title', 'meta_description', 'seo_keywords',
+    'og_title', 'og_description', 'featured_image', 'content_hash'
+)
+
+# Post ids are derived from the slug so tag rows can reference them without a lookup
+BLOG_POST_ID_NAMESPACE = uuid.UUID('5b1f7c2e-8a43-4d0e-9c6a-0f3e2d1b7a90')
+
+# Ids for tags created by the tag stage, stable across runs for the same slug
+BLOG_TAG_ID_NAMESPACE = uuid.UUID('c4d2a8f1-6e0b-4b7a-93d5-2f8e1a6c0b47')
+
+TAG_STAGE_FILE = '00_blog_tags.sql'
+
+# Batch number of every corpus record, one '<position>\t<batch>' line each (both 1-based)
+BATCH_INDEX_FILE = 'batch_index.tsv'
+
+SYSTEM_AUTHOR_ID = '00000000-0000-0000-0000-000000000000'
+
+# Batch budgets: a batch closes before it would exceed either limit, so
+# transaction size stays bounded however long the articles are
+DEFAULT_BATCH_BYTES = 512 * 1024
+DEFAULT_BATCH_STATEMENTS = 100
+
+# Reserved in every batch for the header, footer and the fixed text of the
+# tag-link statement (about 3 KB in the merge format, the longest)
+BATCH_OVERHEAD_BYTES = 4 * 1024
+
+# Articles without a stored published_at are dated days_ago before this day
+PUBLISH_ANCHOR = datetime(2026, 1, 1)
+
+# COPY text format escapes, applied in a single translate pass
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+def published_date_for(article: Dict) -> str:
+    """Publish timestamp: the article's own published_at, else days_ago before PUBLISH_ANCHOR
+
+    Never derived from the current date, so regenerating an unchanged corpus
+    on any day writes byte-identical batch files and the loader ledger skips
+    them.
+    """
+    published_at = article.get('published_at')
+    if published_at:
+        return str(published_at)
+    return (PUBLISH_ANCHOR - timedelta(days=article.get('days_ago', 0))).strftime('%Y-%m-%d %H:%M:%S')
 
 def generate_sql_insert(article: Dict, batch_num: int, index_in_batch: int) -> str:
     """Generate SQL INSERT statement for a single article"""
 
     # Calculate published date (staggered over past 500 days)
-    days_ago = article.get('days_ago', 0)
-    published_date = (datetime.now() - timedelta(days=days_ago)).strftime('%Y-%m-%d %H:%M:%S')
+    published_date = published_date_for(article)
 
     # Build INSERT statement
     sql = f"""
@@ -36,54 +100,107 @@ INSERT INTO blog_posts (
     og_title, og_description, featured_image,
     created_at, updated_at
 ) VALUES (
-    {escape_sql_string(article['title'])},
-    {escape_sql_string(article['slug'])},
-    {escape_sql_string(article['content'])},
-    {escape_sql_string(article['excerpt'])},
-    (SELECT id FROM blog_categories WHERE slug = {escape_sql_string(article['category'])} LIMIT 1),
+    {sql_literal(article['title'])},
+    {sql_literal(article['slug'])},
+    {sql_literal(article['content'])},
+    {sql_literal(article['excerpt'])},
+    (SELECT id FROM blog_categories WHERE slug = {sql_literal(article['category'])} LIMIT 1),
     '00000000-0000-0000-0000-000000000000', -- Default system author
     'published',
     {str(index_in_batch == 0).lower()}, -- First article in each batch is featured
     TIMESTAMP '{published_date}',
     {article.get('reading_time', 5)},
-    {escape_sql_string(article.get('meta_title', article['title']))},
-    {escape_sql_string(article.get('meta_description', article['excerpt']))},
-    {escape_sql_string(article.get('seo_keywords', ''))},
-    {escape_sql_string(article.get('title', article['title']))},
-    {escape_sql_string(article.get('excerpt', article['excerpt']))},
-    {escape_sql_string(article.get('featured_image', ''))},
+    {sql_literal(article.get('meta_title', article['title']))},
+    {sql_literal(article.get('meta_description', article['excerpt']))},
+    {sql_literal(article.get('seo_keywords', ''))},
+    {sql_literal(article.get('title', article['title']))},
+    {sql_literal(article.get('excerpt', article['excerpt']))},
+    {sql_literal(article.get('featured_image', ''))},
     TIMESTAMP '{published_date}',
     TIMESTAMP '{published_date}'
 );
 """
 
-    # Add tags if present
-    if article.get('tags'):
-        sql += f"\n-- Add tags for: {article['title']}\n"
-        sql += "WITH last_post AS (SELECT id FROM blog_posts WHERE slug = " + escape_sql_string(article['slug']) + " LIMIT 1)\n"
+    return sql
 
-        tag_inserts = []
-        for tag in article['tags']:
-            tag_slug = tag.lower().replace(' ', '-')
-            tag_inserts.append(f"""
-INSERT INTO blog_post_tags (post_id, tag_id)
-SELECT
-    (SELECT id FROM last_post),
-    (SELECT id FROM blog_tags WHERE slug = {escape_sql_string(tag_slug)} LIMIT 1)
-WHERE EXISTS (SELECT 1 FROM blog_tags WHERE slug = {escape_sql_string(tag_slug)})
-ON CONFLICT (post_id, tag_id) DO NOTHING;
-""")
+def tag_slug(tag: str) -> str:
+    """Slug used for a tag in blog_tags"""
+    return tag.lower().replace(' ', '-')
+
+def collect_tag_vocabulary(articles: Iterable[Dict], vocabulary: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Collect distinct tags as slug -> display name, adding to vocabulary if given"""
+    if vocabulary is None:
+        vocabulary = {}
+    for article in articles:
+        for tag in article.get('tags', []):
+            vocabulary.setdefault(tag_slug(tag), tag)
+    return vocabulary
+
+def tag_id_for_slug(slug: str, existing_ids: Dict[str, str]) -> str:
+    """Existing blog_tags id for a slug, or the id the tag stage will create"""
+    return existing_ids.get(slug) or str(uuid.uuid5(BLOG_TAG_ID_NAMESPACE, slug))
+
+def generate_tag_stage(vocabulary: Dict[str, str]) -> str:
+    """Generate the tag stage: upsert the whole tag vocabulary in one statement"""
+
+    slugs = sorted(vocabulary)
+    ids = [str(uuid.uuid5(BLOG_TAG_ID_NAMESPACE, slug)) for slug in slugs]
+    names = [vocabulary[slug] for slug in slugs]
+
+    return f"""-- ========================================
+-- Tag stage: {len(slugs)} distinct tags
+-- Run before any batch file
+-- ========================================
+
+INSERT INTO blog_tags (id, slug, name)
+SELECT tag.id::uuid, tag.slug, tag.name
+FROM unnest(
+    {sql_text_array(ids)},
+    {sql_text_array(slugs)},
+    {sql_text_array(names)}
+) AS tag(id, slug, name)
+ON CONFLICT (slug) DO NOTHING;
+"""
 
-        sql += '\n'.join(tag_inserts)
+def generate_tag_links(batch_articles: List[Dict], merged_table: Optional[str] = None) -> str:
+    """Generate a single set-based INSERT linking every post in the batch to its tags
 
-    return sql
+    With merged_table, only posts whose slug is listed in that table are linked.
+    """
+
+    post_slugs = []
+    tag_slugs = []
+    for article in batch_articles:
+        for tag in article.get('tags', []):
+            post_slugs.append(article['slug'])
+            tag_slugs.append(tag_slug(tag))
 
-def generate_batch_file(articles: List[Dict], batch_num: int, batch_size: int = 50) -> str:
-    """Generate complete SQL file for a batch"""
+    if not post_slugs:
+        return ''
 
-    start_idx = (batch_num - 1) * batch_size
-    end_idx = min(start_idx + batch_size, len(articles))
-    batch_articles = articles[start_idx:end_idx]
+    if merged_table:
+        comment = (f"Link tags for the posts of this batch the merge inserted or rewrote "
+                   f"(up to {len(post_slugs)} links)")
+        merged_join = f"\nJOIN {merged_table} merged ON merged.slug = link.post_slug"
+    else:
+        comment = f"Link tags for all {len(batch_articles)} posts in this batch ({len(post_slugs)} links)"
+        merged_join = ""
+
+    return f"""
+-- {comment}
+INSERT INTO blog_post_tags (post_id, tag_id)
+SELECT p.id, t.id
+FROM unnest(
+    {sql_text_array(post_slugs)},
+    {sql_text_array(tag_slugs)}
+) AS link(post_slug, tag_slug){merged_join}
+JOIN blog_posts p ON p.slug = link.post_slug
+JOIN blog_tags t ON t.slug = link.tag_slug
+ON CONFLICT (post_id, tag_id) DO NOTHING;
+"""
+
+def generate_batch_file(batch_articles: List[Dict], batch_num: int) -> Iterator[str]:
+    """Yield the SQL file for a batch, one statement at a time"""
 
     # Determine audience for this batch
     if batch_articles:
@@ -92,113 +209,256 @@ def generate_batch_file(articles: List[Dict], batch_num: int, batch_size: int =
         audience = 'Mixed'
 
     # File header
-    sql_parts = [
+    header = [
         f"-- ========================================",
         f"-- Batch {batch_num}: {audience} Articles",
         f"-- Total articles in batch: {len(batch_articles)}",
-        f"-- Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
         f"-- ========================================\n",
-        f"-- Temporarily disable RLS for bulk insert",
+        f"-- Temporarily disable RLS for bulk insert (blog_loader.py toggles it once per run)",
+        f"\\if :{{?skip_rls_toggle}}",
+        f"\\else",
         f"ALTER TABLE blog_posts DISABLE ROW LEVEL SECURITY;",
-        f"ALTER TABLE blog_post_tags DISABLE ROW LEVEL SECURITY;\n",
+        f"ALTER TABLE blog_post_tags DISABLE ROW LEVEL SECURITY;",
+        f"\\endif\n",
         f"-- Begin transaction",
         f"BEGIN;\n"
     ]
+    yield '\n'.join(header) + '\n'
 
     # Generate INSERT statements
     for i, article in enumerate(batch_articles):
-        sql_parts.append(generate_sql_insert(article, batch_num, i))
+        yield generate_sql_insert(article, batch_num, i) + '\n'
+
+    # Link tags for the whole batch in one statement
+    tag_links = generate_tag_links(batch_articles)
+    if tag_links:
+        yield tag_links + '\n'
 
     # File footer
-    sql_parts.extend([
+    footer = [
         "\n-- Commit transaction",
         "COMMIT;\n",
         "-- Re-enable RLS",
+        "\\if :{?skip_rls_toggle}",
+        "\\else",
         "ALTER TABLE blog_posts ENABLE ROW LEVEL SECURITY;",
-        "ALTER TABLE blog_post_tags ENABLE ROW LEVEL SECURITY;\n",
+        "ALTER TABLE blog_post_tags ENABLE ROW LEVEL SECURITY;",
+        "\\endif\n",
         f"-- Batch {batch_num} complete",
         f"-- Articles inserted: {len(batch_articles)}"
-    ])
-
-    return '\n'.join(sql_parts)
-
-def create_master_script(num_batches: int) -> str:
-    """Create master script to execute all batches"""
-
-    script = r"""#!/bin/bash
-# Master script to insert all 500 blog articles
-# Usage: ./insert_all_blog_articles.sh
-
-set -e  # Exit on error
-
-echo "========================================="
-echo "Blog Articles Bulk Insert Script"
-echo "========================================="
-echo ""
-
-# Database connection details
-DB_HOST="aws-0-ap-south-1.pooler.supabase.com"
-DB_PORT="5432"
-DB_USER="postgres.afrulkxxzcmngbrdfuzj"
-DB_NAME="postgres"
-DB_PASSWORD="hirendra$1234ABCD"
-
-echo "Database: $DB_HOST"
-echo "User: $DB_USER"
-echo ""
-
-# Function to execute SQL file
-execute_batch() {
-    local batch_num=$1
-    local filename="batch_${batch_num}_blog_articles.sql"
-
-    echo "Executing Batch $batch_num: $filename"
+    ]
+    yield '\n'.join(footer) + '\n'
+
+
+def copy_field(value) -> str:
+    """Encode a single value for the COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return str(value).translate(COPY_ESCAPES)
+
+def post_id_for_slug(slug: str) -> str:
+    """Deterministic blog_posts.id for a slug"""
+    return str(uuid.uuid5(BLOG_POST_ID_NAMESPACE, slug))
+
+def blog_post_values(article: Dict, index_in_batch: int, category) -> Tuple:
+    """Row values for one article, in BLOG_POST_COPY_COLUMNS order"""
+    published_date = published_date_for(article)
+
+    return (
+        post_id_for_slug(article['slug']),
+        article['title'],
+        article['slug'],
+        article['content'],
+        article['excerpt'],
+        category,
+        SYSTEM_AUTHOR_ID,
+        'published',
+        index_in_batch == 0,  # First article in each batch is featured
+        published_date,
+        article.get('reading_time', 5),
+        article.get('meta_title', article['title']),
+        article.get('meta_description', article['excerpt']),
+        article.get('seo_keywords', ''),
+        article['title'],
+        article['excerpt'],
+        article.get('featured_image', ''),
+        published_date,
+        published_date
+    )
+
+def fetch_id_map(table: str) -> Dict[str, str]:
+    """Resolve slug -> id for a lookup table in one query (uses PG* env vars)"""
+    result = subprocess.run(
+        ['psql', '-X', '-A', '-t', '-F', '\t', '-c', f'SELECT slug, id FROM {table}'],
+        capture_output=True, text=True, check=True
+    )
+    id_map = {}
+    for line in result.stdout.splitlines():
+        if line:
+            slug, row_id = line.split('\t')
+            id_map[slug] = row_id
+    return id_map
+
+def generate_copy_batch(batch_articles: List[Dict], category_ids: Dict[str, str],
+                        existing_tag_ids: Dict[str, str]) -> Tuple[str, str]:
+    """Generate COPY data for a batch: (blog_posts rows, blog_post_tags rows)"""
+
+    post_rows = []
+    tag_rows = []
 
-    PGPASSWORD="$DB_PASSWORD" psql \\
-        -h "$DB_HOST" \\
-        -p "$DB_PORT" \\
-        -U "$DB_USER" \\
-        -d "$DB_NAME" \\
-        -f "$filename" \\
-        --quiet
+    for i, article in enumerate(batch_articles):
+        post_id = post_id_for_slug(article['slug'])
+        values = blog_post_values(article, i, category_ids.get(article['category']))
+        post_rows.append('\t'.join(copy_field(value) for value in values))
+
+        for tag in article.get('tags', []):
+            tag_rows.append(f'{post_id}\t{tag_id_for_slug(tag_slug(tag), existing_tag_ids)}')
+
+    # A tag repeated on an article (or a slug repeated in the batch) would
+    # otherwise write the same link twice
+    tag_rows = list(dict.fromkeys(tag_rows))
+
+    posts_data = '\n'.join(post_rows) + '\n' if post_rows else ''
+    tags_data = '\n'.join(tag_rows) + '\n' if tag_rows else ''
+    return posts_data, tags_data
+
+def blog_post_content_hash(values: Tuple) -> str:
+    """sha256 of a row's content fields (category as its slug), NULLs skipped like concat_ws"""
+    fields = (values[i] for i in CONTENT_HASH_INDEXES)
+    return hashlib.sha256('\x1f'.join(str(field) for field in fields if field is not None).encode('utf-8')).hexdigest()
+
+def generate_merge_batch(batch_articles: List[Dict], batch_num: int) -> Iterator[str]:
+    """Yield a staging merge file for a batch, one statement (or COPY row) at a time
+
+    The batch is COPYed into a staging table, then merged into blog_posts in
+    one statement: new slugs are inserted, and a live post is rewritten only
+    when its content hash differs. Unchanged posts are filtered out before
+    the insert, so they are not even locked. Tags are linked only for the
+    posts the merge returned. Staging tables are session-local TEMP tables
+    dropped at commit (never WAL-logged), so concurrent loads and reruns
+    after a crash cannot collide on them.
+    """
+
+    audience = batch_articles[0]['audience'] if batch_articles else 'Mixed'
+    staging = 'blog_posts_staging'
+    merged = 'blog_posts_merged'
+
+    staged_columns = ['category_slug' if column == 'category_id' else column for column in BLOG_POST_COPY_COLUMNS]
+    live_columns = list(BLOG_POST_COPY_COLUMNS) + ['content_hash']
+    selected = [
+        '(SELECT id FROM blog_categories WHERE slug = s.category_slug LIMIT 1)' if column == 'category_id'
+        else f's.{column}'
+        for column in live_columns
+    ]
+    updates = [f'{column} = EXCLUDED.{column}' for column in MERGE_UPDATE_COLUMNS] + ['updated_at = NOW()']
 
-    if [ $? -eq 0 ]; then
-        echo "✓ Batch $batch_num completed successfully"
-    else
-        echo "✗ Batch $batch_num failed"
-        exit 1
-    fi
+    header = [
+        f"-- ========================================",
+        f"-- Batch {batch_num}: {audience} Articles (staging merge)",
+        f"-- Total articles in batch: {len(batch_articles)}",
+        f"-- ========================================\n",
+        f"BEGIN;\n",
+        f"-- Session-local staging tables shaped like blog_posts, dropped at commit",
+        f"CREATE TEMP TABLE {staging} (LIKE blog_posts INCLUDING DEFAULTS, category_slug TEXT) ON COMMIT DROP;",
+        f"CREATE TEMP TABLE {merged} (slug TEXT PRIMARY KEY) ON COMMIT DROP;\n",
+        f"-- Quiet so the loader's row count reflects the merge, not the staging COPY",
+        f"\\set QUIET on",
+        f"COPY {staging} ({', '.join(staged_columns + ['content_hash'])}) FROM STDIN;"
+    ]
+    yield '\n'.join(header) + '\n'
 
-    echo ""
-}
+    for i, article in enumerate(batch_articles):
+        values = blog_post_values(article, i, article['category'])
+        yield '\t'.join(copy_field(value) for value in values + (blog_post_content_hash(values),)) + '\n'
+
+    merge = [
+        "\\.",
+        "\\set QUIET off\n",
+        "-- Merge: insert new posts, rewrite a live post only when its content changed;",
+        f"-- the slugs it touched are kept in {merged} (the loader counts this INSERT)",
+        "WITH upserted AS (",
+        f"INSERT INTO blog_posts AS p ({', '.join(live_columns)})",
+        f"SELECT {', '.join(selected)}",
+        f"FROM {staging} s",
+        "WHERE NOT EXISTS (",
+        "    SELECT 1 FROM blog_posts live",
+        "    WHERE live.slug = s.slug AND live.content_hash = s.content_hash",
+        ")",
+        "ON CONFLICT (slug) DO UPDATE SET",
+        '    ' + ',\n    '.join(updates),
+        "WHERE p.content_hash IS DISTINCT FROM EXCLUDED.content_hash",
+        "RETURNING p.slug",
+        ")",
+        f"INSERT INTO {merged} (slug) SELECT slug FROM upserted;"
+    ]
+    yield '\n'.join(merge) + '\n'
 
-# Execute all batches
-"""
+    tag_links = generate_tag_links(batch_articles, merged_table=merged)
+    if tag_links:
+        yield tag_links + '\n'
 
-    for i in range(1, num_batches + 1):
-        script += f"execute_batch {i}\n"
-
-    script += """
-echo "========================================="
-echo "All batches completed successfully!"
-echo "========================================="
-echo ""
-echo "Verifying insertion..."
-
-# Count total articles
-TOTAL=$(PGPASSWORD="$DB_PASSWORD" psql \\
-    -h "$DB_HOST" \\
-    -p "$DB_PORT" \\
-    -U "$DB_USER" \\
-    -d "$DB_NAME" \\
-    -t -c "SELECT COUNT(*) FROM blog_posts;")
-
-echo "Total articles in database: $TOTAL"
-echo ""
-echo "Done!"
-"""
+    footer = [
+        "COMMIT;\n",
+        f"-- Batch {batch_num} complete",
+        f"-- Articles merged: {len(batch_articles)}"
+    ]
+    yield '\n'.join(footer) + '\n'
+
+def create_copy_driver(num_batches: int, compression: Optional[str] = None) -> str:
+    """Create psql driver that loads the COPY data files, one transaction per batch
+
+    COPY cannot skip conflicts, so each batch is copied into session-local
+    staging tables and inserted from there with ON CONFLICT DO NOTHING: posts
+    already live (by slug) and links already present are left alone. RLS is
+    disabled inside each batch transaction, so a failing batch rolls the
+    toggle back with it and never leaves the tables unprotected.
+    """
+
+    columns = ', '.join(BLOG_POST_COPY_COLUMNS)
+
+    def source(filename: str) -> str:
+        suffix = COMPRESSION_SUFFIXES.get(compression)
+        if suffix is None:
+            return f"'{filename}'"
+        return f"PROGRAM '{' '.join(DECOMPRESSORS[suffix])} {filename}{suffix}'"
+
+    lines = [
+        "-- COPY loader for blog articles",
+        "-- Usage (from this directory): psql -f load_copy_blog_articles.sql",
+        "\\set ON_ERROR_STOP on\n",
+        "-- Upsert the tag vocabulary before linking",
+        f"\\i {TAG_STAGE_FILE}\n"
+    ]
 
-    return script
+    for batch_num in range(1, num_batches + 1):
+        lines.extend([
+            f"\\echo Loading batch {batch_num:02d}",
+            "BEGIN;",
+            "ALTER TABLE blog_posts DISABLE ROW LEVEL SECURITY;",
+            "ALTER TABLE blog_post_tags DISABLE ROW LEVEL SECURITY;",
+            "CREATE TEMP TABLE blog_posts_staging (LIKE blog_posts INCLUDING DEFAULTS) ON COMMIT DROP;",
+            "CREATE TEMP TABLE blog_post_tags_staging (post_id UUID, tag_id UUID) ON COMMIT DROP;",
+            f"\\copy blog_posts_staging ({columns}) FROM {source(f'batch_{batch_num:02d}_blog_posts.copy')}",
+            f"\\copy blog_post_tags_staging (post_id, tag_id) FROM {source(f'batch_{batch_num:02d}_blog_post_tags.copy')}",
+            f"INSERT INTO blog_posts ({columns})",
+            f"SELECT {columns} FROM blog_posts_staging",
+            "ON CONFLICT (slug) DO NOTHING;",
+            "-- Link through the slug: a post that was already live keeps its own id",
+            "INSERT INTO blog_post_tags (post_id, tag_id)",
+            "SELECT DISTINCT p.id, t.id",
+            "FROM blog_post_tags_staging link",
+            "JOIN blog_posts_staging s ON s.id = link.post_id",
+            "JOIN blog_posts p ON p.slug = s.slug",
+            "JOIN blog_tags t ON t.id = link.tag_id",
+            "ON CONFLICT (post_id, tag_id) DO NOTHING;",
+            "ALTER TABLE blog_posts ENABLE ROW LEVEL SECURITY;",
+            "ALTER TABLE blog_post_tags ENABLE ROW LEVEL SECURITY;",
+            "COMMIT;\n"
+        ])
+
+    return '\n'.join(lines) + '\n'
 
 def create_verification_queries() -> str:
     """Create SQL file with verification queries"""
@@ -349,49 +609,171 @@ SELECT
 FROM blog_posts;
 """
 
-if __name__ == '__main__':
-    # Load articles with content
-    with open('/home/vik/aiborg_CC/aiborg-learn-sphere/scripts/articles_with_content.json', 'r') as f:
-        articles = json.load(f)
+def article_bytes(article: Dict) -> int:
+    """Bytes an article adds to a batch file, in whichever format writes more
+
+    Measured on the rendered text: the INSERT statement (as a later, unfeatured
+    article) or the merge COPY row with its content hash, plus the article's
+    entries in the tag-link arrays.
+    """
+    insert = generate_sql_insert(article, 0, 998)
+    values = blog_post_values(article, 1, article['category'])
+    copy_row = '\t'.join(copy_field(value) for value in values) + '\t' + '0' * 64 + '\n'
+    links = ''.join(f"{sql_literal(article['slug'])}, {sql_literal(tag_slug(tag))}, "
+                    for tag in article.get('tags', []))
+    return max(len(insert.encode('utf-8')) + 1, len(copy_row.encode('utf-8'))) + len(links.encode('utf-8'))
+
+def partition_articles(articles: Iterable[Dict], max_bytes: int = DEFAULT_BATCH_BYTES,
+                       max_statements: int = DEFAULT_BATCH_STATEMENTS) -> Iterator[List[Dict]]:
+    """Audience-homogeneous batches whose files stay within max_bytes and max_statements"""
+    return iter_budget_batches(articles, article_bytes, max_bytes - BATCH_OVERHEAD_BYTES, max_statements,
+                               key='audience')
+
+def partition_with_index(articles: Iterable[Dict], path: str, max_bytes: int = DEFAULT_BATCH_BYTES,
+                         max_statements: int = DEFAULT_BATCH_STATEMENTS) -> Iterator[List[Dict]]:
+    """partition_articles, also writing each record's batch number to path (BATCH_INDEX_FILE format)
+
+    The file is moved into place once every batch has been consumed.
+    """
+    positions = {}
+
+    def tracked():
+        for position, article in enumerate(articles, 1):
+            positions[id(article)] = position
+            yield article
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for batch_num, batch_articles in enumerate(partition_articles(tracked(), max_bytes, max_statements), 1):
+            f.writelines(f'{positions.pop(id(article))}\t{batch_num}\n' for article in batch_articles)
+            yield batch_articles
+    os.replace(tmp_path, path)
+
+def add_batch_arguments(parser):
+    parser.add_argument('--max-batch-bytes', type=int, default=DEFAULT_BATCH_BYTES,
+                        help=f'Bytes per batch file before compression (default: {DEFAULT_BATCH_BYTES})')
+    parser.add_argument('--max-batch-statements', type=int, default=DEFAULT_BATCH_STATEMENTS,
+                        help=f'Articles (INSERT statements / rows) per batch (default: {DEFAULT_BATCH_STATEMENTS})')
+
+def batch_size_report(sizes: List[Tuple[str, int, int]]) -> List[str]:
+    """Distribution of (audience, articles, bytes written) over the batches"""
+    if not sizes:
+        return ["  No batches"]
+
+    def spread(values: List[int], unit: str = '') -> str:
+        values = sorted(values)
+        pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+        return (f"min {values[0]:,}{unit}  p50 {pick(0.5):,}{unit}  "
+                f"p90 {pick(0.9):,}{unit}  max {values[-1]:,}{unit}")
+
+    lines = [
+        f"  Batches: {len(sizes)}",
+        f"  Articles per batch:     {spread([articles for _, articles, _ in sizes])}",
+        f"  KB per batch (on disk): {spread([size // 1024 for _, _, size in sizes])}",
+    ]
+    for audience in sorted({audience for audience, _, _ in sizes}):
+        group = [(articles, size) for name, articles, size in sizes if name == audience]
+        lines.append(f"    {audience}: {len(group)} batches, "
+                     f"{sum(a for a, _ in group) / len(group):.1f} articles / "
+                     f"{sum(b for _, b in group) / len(group) / 1024:,.0f} KB avg")
+    return lines
 
-    print(f"Generating SQL scripts for {len(articles)} articles...")
-    print("")
+def write_copy_files(batches: Iterable[List[Dict]], output_dir: str, vocabulary: Dict[str, str],
+                     compression: Optional[str] = None) -> List[Tuple[str, int, int]]:
+    """Write COPY data files and their psql driver, returns the batch sizes"""
 
-    # Create output directory
-    output_dir = '/home/vik/aiborg_CC/aiborg-learn-sphere/scripts/blog_inserts'
-    os.makedirs(output_dir, exist_ok=True)
+    # Resolve category and tag ids once for the whole corpus
+    category_ids = fetch_id_map('blog_categories')
+    existing_tag_ids = fetch_id_map('blog_tags')
 
-    # Generate batch files (50 articles per batch)
-    batch_size = 50
-    num_batches = (len(articles) + batch_size - 1) // batch_size
+    sizes = []
+    for batch_num, batch_articles in enumerate(batches, 1):
+        collect_tag_vocabulary(batch_articles, vocabulary)
+        with METRICS.time('sql_render_seconds'):
+            posts_data, tags_data = generate_copy_batch(batch_articles, category_ids, existing_tag_ids)
+        METRICS.inc('articles_rendered_total', len(batch_articles))
 
-    for batch_num in range(1, num_batches + 1):
-        batch_sql = generate_batch_file(articles, batch_num, batch_size)
+        written = write_sql(f'{output_dir}/batch_{batch_num:02d}_blog_posts.copy', [posts_data], compression)
+        written += write_sql(f'{output_dir}/batch_{batch_num:02d}_blog_post_tags.copy', [tags_data], compression)
+        sizes.append((batch_articles[0]['audience'], len(batch_articles), written))
 
-        filename = f'{output_dir}/batch_{batch_num:02d}_blog_articles.sql'
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(batch_sql)
+        print(f"  ✓ Generated COPY batch {batch_num:02d}: {len(batch_articles)} articles")
 
-        articles_in_batch = min(batch_size, len(articles) - (batch_num - 1) * batch_size)
-        print(f"  ✓ Generated batch {batch_num:02d}: {articles_in_batch} articles")
+    write_text(f'{output_dir}/load_copy_blog_articles.sql', create_copy_driver(len(sizes), compression))
+    print(f"\n  ✓ Created COPY driver (load_copy_blog_articles.sql)")
 
-    # Create master execution script
-    master_script = create_master_script(num_batches)
-    with open(f'{output_dir}/insert_all_blog_articles.sh', 'w') as f:
-        f.write(master_script)
-    os.chmod(f'{output_dir}/insert_all_blog_articles.sh', 0o755)
-    print(f"\n  ✓ Created master execution script")
+    return sizes
+
+def write_tag_stage(output_dir: str, vocabulary: Dict[str, str]):
+    """Write the tag stage file; the loader runs it before any batch"""
+    write_text(f'{output_dir}/{TAG_STAGE_FILE}', generate_tag_stage(vocabulary))
+    print(f"  ✓ Generated tag stage: {len(vocabulary)} distinct tags")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate SQL load scripts for blog articles')
+    parser.add_argument('--input', default=CONTENT_FILE, help="Article corpus (NDJSON), or '-' for stdin")
+    parser.add_argument('--output-dir', default=os.path.join(SCRIPTS_DIR, 'blog_inserts'),
+                        help='Directory for the generated files (default: scripts/blog_inserts)')
+    parser.add_argument('--format', choices=['sql', 'copy', 'merge'], default='sql',
+                        help='sql: INSERT batch files (default); copy: COPY data files + psql driver; '
+                             'merge: batch files that stage and merge by slug, rewriting only changed posts')
+    add_batch_arguments(parser)
+    add_compression_argument(parser)
+    metrics.add_metrics_argument(parser)
+    args = parser.parse_args()
+
+    metrics.enable('sql', args.metrics_dir)
+    compression = None if args.compress == 'none' else args.compress
+
+    print(f"Generating SQL scripts from {args.input}...")
+    print("")
+
+    # Create output directory
+    output_dir = args.output_dir
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Articles are streamed; the tag vocabulary is collected along the way
+    articles = read_records(args.input)
+    vocabulary = {}
+
+    # Batches are sized by encoded bytes and statement count, one audience each;
+    # the batch index lets the content inventory name each article's batch
+    batches = partition_with_index(articles, f'{output_dir}/{BATCH_INDEX_FILE}',
+                                   args.max_batch_bytes, args.max_batch_statements)
+
+    if args.format == 'copy':
+        sizes = write_copy_files(batches, output_dir, vocabulary, compression)
+        write_tag_stage(output_dir, vocabulary)
+        print(f"\nBatch sizes:")
+        print('\n'.join(batch_size_report(sizes)))
+        print(f"\nTo load all articles:")
+        print(f"  cd {output_dir}")
+        print(f"  psql -f load_copy_blog_articles.sql")
+        raise SystemExit(0)
+
+    render_batch = generate_merge_batch if args.format == 'merge' else generate_batch_file
+
+    sizes = []
+    for batch_num, batch_articles in enumerate(batches, 1):
+        collect_tag_vocabulary(batch_articles, vocabulary)
+        # Statements stream from the renderer straight into the (compressed) file
+        with METRICS.time('sql_render_seconds'):
+            written = write_sql(f'{output_dir}/batch_{batch_num:02d}_blog_articles.sql',
+                                render_batch(batch_articles, batch_num), compression)
+        METRICS.inc('articles_rendered_total', len(batch_articles))
+        sizes.append((batch_articles[0]['audience'], len(batch_articles), written))
+
+        print(f"  ✓ Generated batch {batch_num:02d}: {len(batch_articles)} articles ({written // 1024:,} KB)")
+
+    # Tag stage: upsert the distinct tag vocabulary once
+    write_tag_stage(output_dir, vocabulary)
 
     # Create verification queries
-    verification_sql = create_verification_queries()
-    with open(f'{output_dir}/verify_articles.sql', 'w') as f:
-        f.write(verification_sql)
-    print(f"  ✓ Created verification queries")
+    write_text(f'{output_dir}/verify_articles.sql', create_verification_queries())
+    print(f"\n  ✓ Created verification queries")
 
     # Create quick stats
-    stats_sql = create_quick_stats_query()
-    with open(f'{output_dir}/quick_stats.sql', 'w') as f:
-        f.write(stats_sql)
+    write_text(f'{output_dir}/quick_stats.sql', create_quick_stats_query())
     print(f"  ✓ Created quick stats query")
 
     print("")
@@ -401,11 +783,15 @@ if __name__ == '__main__':
     print(f"Location: {output_dir}/")
     print(f"")
     print(f"Files created:")
-    print(f"  - {num_batches} batch SQL files (50 articles each)")
-    print(f"  - insert_all_blog_articles.sh (master script)")
+    print(f"  - {len(sizes)} batch_*.sql{COMPRESSION_SUFFIXES.get(compression, '')} files (up to {args.max_batch_bytes // 1024:,} KB / "
+          f"{args.max_batch_statements} articles each{', staging merge' if args.format == 'merge' else ''})")
+    print(f"  - {TAG_STAGE_FILE} (tag stage, runs first)")
+    print(f"  - {BATCH_INDEX_FILE} (batch number of each article, for the content inventory)")
     print(f"  - verify_articles.sql (verification queries)")
     print(f"  - quick_stats.sql (quick statistics)")
     print(f"")
-    print(f"To insert all articles:")
-    print(f"  cd {output_dir}")
-    print(f"  ./insert_all_blog_articles.sh")
+    print(f"Batch sizes:")
+    print('\n'.join(batch_size_report(sizes)))
+    print(f"")
+    print(f"To insert all articles (set PGHOST/PGUSER/PGPASSWORD/PGDATABASE first):")
+    print(f"  python blog_loader.py {output_dir} --workers 4")
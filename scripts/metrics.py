@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Pipeline Metrics
+In-process counters and timing histograms shared by the content scripts,
+exported at exit as a Prometheus textfile and a JSON summary:
+
+    python content_generator.py --metrics-dir /var/lib/node_exporter/textfile
+    -> content.prom, content.json
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+METRICS_DIR_ENV = 'BLOG_PIPELINE_METRICS_DIR'
+METRIC_PREFIX = 'blog_pipeline'
+
+# Upper bounds in seconds, from a single template fill up to a slow psql batch
+LATENCY_BUCKETS = (0.000001, 0.000005, 0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005,
+                   0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect and two additions"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count', 'max')
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation"""
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def merge(self, other: Dict):
+        for i, count in enumerate(other['counts']):
+            self.counts[i] += count
+        self.sum += other['sum']
+        self.count += other['count']
+        self.max = max(self.max, other['max'])
+
+    def to_dict(self) -> Dict:
+        return {'counts': list(self.counts), 'sum': self.sum, 'count': self.count, 'max': self.max}
+
+class _Timer:
+    __slots__ = ('registry', 'name', 'start')
+
+    def __init__(self, registry, name: str):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.observe(self.name, time.perf_counter() - self.start)
+
+class MetricsRegistry:
+    """Counters and histograms for one pipeline stage
+
+    Recording is always on and cheap; nothing is written unless export() runs.
+    Worker processes send their registry back with drain() and the parent
+    folds it in with merge().
+    """
+
+    def __init__(self):
+        self.stage = os.path.splitext(os.path.basename(sys.argv[0] or 'pipeline'))[0]
+        self.started_at = time.time()
+        self.counters: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def time(self, name: str) -> _Timer:
+        """Context manager recording the block's duration into histogram `name`"""
+        return _Timer(self, name)
+
+    def drain(self) -> Dict:
+        """Return and reset everything recorded so far (for worker processes)"""
+        with self._lock:
+            snapshot = {
+                'counters': self.counters,
+                'histograms': {name: h.to_dict() for name, h in self.histograms.items()}
+            }
+            self.counters = {}
+            self.histograms = {}
+        return snapshot
+
+    def merge(self, snapshot: Dict):
+        with self._lock:
+            for name, value in snapshot['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for name, data in snapshot['histograms'].items():
+                self.histograms.setdefault(name, Histogram()).merge(data)
+
+    def summary(self) -> Dict:
+        duration = time.time() - self.started_at
+        return {
+            'stage': self.stage,
+            'started_at': datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(timespec='seconds'),
+            'duration_seconds': round(duration, 3),
+            'counters': dict(sorted(self.counters.items())),
+            'histograms': {
+                name: {
+                    'count': h.count,
+                    'sum': round(h.sum, 6),
+                    'mean': h.sum / h.count if h.count else 0.0,
+                    'p50': h.quantile(0.50),
+                    'p95': h.quantile(0.95),
+                    'p99': h.quantile(0.99),
+                    'max': h.max
+                }
+                for name, h in sorted(self.histograms.items())
+            }
+        }
+
+    def prometheus_text(self) -> str:
+        label = f'stage="{self.stage}"'
+        lines = [
+            f'# TYPE {METRIC_PREFIX}_stage_duration_seconds gauge',
+            f'{METRIC_PREFIX}_stage_duration_seconds{{{label}}} {time.time() - self.started_at:.6f}'
+        ]
+
+        for name, value in sorted(self.counters.items()):
+            metric = f'{METRIC_PREFIX}_{name}'
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric}{{{label}}} {value}')
+
+        for name, h in sorted(self.histograms.items()):
+            metric = f'{METRIC_PREFIX}_{name}'
+            lines.append(f'# TYPE {metric} histogram')
+            cumulative = 0
+            for bound, count in zip(list(h.buckets) + ['+Inf'], h.counts):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{{label}}} {h.sum:.9f}')
+            lines.append(f'{metric}_count{{{label}}} {h.count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def export(self, metrics_dir: str):
+        """Write <stage>.prom and <stage>.json; each file is replaced atomically"""
+        os.makedirs(metrics_dir, exist_ok=True)
+        outputs = (
+            (f'{self.stage}.prom', self.prometheus_text()),
+            (f'{self.stage}.json', json.dumps(self.summary(), indent=2) + '\n')
+        )
+        for filename, text in outputs:
+            path = os.path.join(metrics_dir, filename)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+
+METRICS = MetricsRegistry()
+
+def enable(stage: str, metrics_dir: Optional[str]):
+    """Name this process's stage and export its metrics at exit (if metrics_dir is set)"""
+    METRICS.stage = stage
+    if metrics_dir:
+        atexit.register(METRICS.export, metrics_dir)
+
+def add_metrics_argument(parser):
+    parser.add_argument('--metrics-dir', default=os.environ.get(METRICS_DIR_ENV),
+                        help=f'Write <stage>.prom and <stage>.json here at exit (default: ${METRICS_DIR_ENV})')
+
+def write_text(path: str, text: str, encoding: str = 'utf-8') -> int:
+    """Write a generated file, recording its write time and size; returns bytes written"""
+    data = text.encode(encoding)
+    with METRICS.time('file_write_seconds'):
+        with open(path, 'wb') as f:
+            f.write(data)
+    METRICS.inc('files_written_total')
+    METRICS.inc('bytes_emitted_total', len(data))
+    return len(data)
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection for Generated Articles
+MinHash signatures over word shingles plus LSH banding, so clusters of
+near-identical bodies are found without comparing every pair of articles
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Signatures fall back to pure Python (fine for small corpora)
+    np = None
+
+import metrics
+from corpus_io import CONTENT_FILE, CORPUS_NEWLINE, SCRIPTS_DIR, iter_batches, read_records, write_records
+from metrics import METRICS, write_text
+
+REPORT_FILE = os.path.join(SCRIPTS_DIR, 'near_duplicates_report.json')
+
+SHINGLE_SIZE = 5            # Words per shingle
+NUM_PERM = 128              # MinHash permutations per signature
+SIMILARITY_THRESHOLD = 0.8  # Estimated Jaccard similarity that counts as a near-duplicate
+MAX_BUCKET_CANDIDATES = 4   # Kept articles an LSH bucket offers for comparison
+SEED = 1
+
+MAX_HASH = (1 << 32) - 1
+MASK64 = (1 << 64) - 1
+SHINGLE_BASE = 1000003
+
+class MinHasher:
+    """MinHash signatures of article bodies
+
+    Words are hashed once (crc32, cached per process), shingle hashes are a
+    polynomial over SHINGLE_SIZE word hashes, and each permutation is the
+    multiply-shift hash ((a * x + b) mod 2^64) >> 32 with a random odd a, which
+    needs no division. The numpy and pure-Python paths use the same
+    arithmetic, so signatures are identical either way.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, shingle_size: int = SHINGLE_SIZE,
+                 seed: int = SEED, newline: str = CORPUS_NEWLINE):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.newline = newline
+        rng = random.Random(seed)
+        self.a = [rng.getrandbits(64) | 1 for _ in range(num_perm)]
+        self.b = [rng.getrandbits(64) for _ in range(num_perm)]
+        self.word_hashes = {}
+        if np is not None:
+            self.a_array = np.array(self.a, dtype=np.uint64)[:, None]
+            self.b_array = np.array(self.b, dtype=np.uint64)[:, None]
+
+    def __getstate__(self):
+        # The word cache is rebuilt in each worker rather than pickled per chunk
+        state = self.__dict__.copy()
+        state['word_hashes'] = {}
+        return state
+
+    def word_hashes_of(self, text: str) -> List[int]:
+        """crc32 of each lowercased word, in order"""
+        words = text.replace(self.newline, ' ').lower().split()
+        word_hashes = self.word_hashes
+        hashes = list(map(word_hashes.get, words))
+        if None in hashes:
+            for i, word in enumerate(words):
+                if hashes[i] is None:
+                    hashes[i] = word_hashes[word] = zlib.crc32(word.encode('utf-8'))
+        return hashes
+
+    def signature(self, text: str) -> Optional[array]:
+        """MinHash signature as array('I'), or None for a body without words"""
+        hashes = self.word_hashes_of(text)
+        if not hashes:
+            return None
+        k = min(self.shingle_size, len(hashes))
+        count = len(hashes) - k + 1
+
+        if np is not None:
+            words = np.array(hashes, dtype=np.uint64)
+            shingles = np.zeros(count, dtype=np.uint64)
+            for j in range(k):
+                shingles = shingles * np.uint64(SHINGLE_BASE) + words[j:j + count]
+            x = np.unique(shingles & np.uint64(MAX_HASH))
+            permuted = self.a_array * x
+            permuted += self.b_array
+            permuted >>= np.uint64(32)
+            return array('I', permuted.min(axis=1).astype(np.uint32).tobytes())
+
+        shingles = set()
+        for i in range(count):
+            h = 0
+            for j in range(i, i + k):
+                h = (h * SHINGLE_BASE + hashes[j]) & MAX_HASH
+            shingles.add(h)
+        return array('I', [
+            min(((a * x + b) & MASK64) >> 32 for x in shingles)
+            for a, b in zip(self.a, self.b)
+        ])
+
+def _signature_chunk(task: Tuple[MinHasher, List[str]]) -> Tuple[List[Optional[array]], Dict]:
+    """Pool task: sign a chunk of bodies and hand this worker's metrics back to the parent"""
+    hasher, texts = task
+    signatures = [hasher.signature(text) for text in texts]
+    METRICS.inc('articles_fingerprinted_total', len(texts))
+    return signatures, METRICS.drain()
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """(bands, rows) whose LSH threshold (1/bands)^(1/rows) is the highest one not above threshold
+
+    Leaning low favours recall; candidates are verified against the real
+    threshold afterwards, so false positives cost time, not accuracy.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+def similarity(left: array, right: array) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for x, y in zip(left, right) if x == y) / len(left)
+
+class NearDuplicateIndex:
+    """Signatures of a corpus, clustered with LSH banding
+
+    Articles are decided in corpus order against the articles already kept:
+    each band maps its slice of the signature to the kept articles that had
+    it, a new article is compared with the kept articles it shares a bucket
+    with, and it is a near-duplicate of the most similar one if that
+    similarity reaches the threshold. Otherwise it is kept and added to its
+    buckets. Every blocked article is therefore above the threshold against
+    the article it is reported under, never just transitively linked to it.
+
+    A bucket holds at most MAX_BUCKET_CANDIDATES kept articles, so an article
+    is compared with at most bands * MAX_BUCKET_CANDIDATES others however
+    templated the corpus is. A near-duplicate of a kept article that only
+    ever landed in full buckets can be missed; one sharing any other band
+    with it is still found.
+    """
+
+    def __init__(self, hasher: MinHasher, threshold: float = SIMILARITY_THRESHOLD):
+        self.hasher = hasher
+        self.threshold = threshold
+        self.bands, self.rows = choose_bands(hasher.num_perm, threshold)
+        self.slugs: List[str] = []
+        self.signatures: List[Optional[array]] = []
+
+    def add_corpus(self, records: Iterable[Dict], workers: int = 1, chunk_size: int = 256):
+        """Fingerprint a record stream, keeping only slugs and signatures"""
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        next_progress = 10000
+        try:
+            for window in iter_batches(records, max(workers, 1) * chunk_size * 4):
+                self.slugs.extend(record.get('slug', '') for record in window)
+                texts = [record.get('content', '') for record in window]
+                tasks = [(self.hasher, chunk) for chunk in iter_batches(texts, chunk_size)]
+                results = pool.map(_signature_chunk, tasks) if pool else map(_signature_chunk, tasks)
+                for signatures, worker_metrics in results:
+                    self.signatures.extend(signatures)
+                    METRICS.merge(worker_metrics)
+                if len(self.slugs) >= next_progress:
+                    next_progress += 10000
+                    print(f"  Progress: {len(self.slugs)} articles fingerprinted...", file=sys.stderr)
+        finally:
+            if pool:
+                pool.shutdown()
+
+    def clusters(self) -> List[List[int]]:
+        """Clusters as corpus indexes: the kept article first, then its near-duplicates in corpus order"""
+        with METRICS.time('lsh_cluster_seconds'):
+            if np is not None:
+                matrix = self._signature_matrix()
+                band_keys = self._band_keys_numpy(matrix)
+            else:
+                matrix = None
+                band_keys = self._band_keys_python()
+            buckets = [{} for _ in range(self.bands)]
+            groups = {}
+            comparisons = 0
+            for i, keys in enumerate(band_keys):
+                if keys is None:
+                    continue
+                candidates = []
+                for band, key in enumerate(keys):
+                    candidates.extend(buckets[band].get(key, ()))
+                best = self._best_match(i, candidates, matrix) if candidates else None
+                comparisons += len(candidates)
+
+                if best is None:
+                    for band, key in enumerate(keys):
+                        bucket = buckets[band].setdefault(key, [])
+                        if len(bucket) < MAX_BUCKET_CANDIDATES:
+                            bucket.append(i)
+                else:
+                    groups.setdefault(best, [best]).append(i)
+            METRICS.inc('lsh_comparisons_total', comparisons)
+        return sorted(groups.values(), key=lambda members: members[0])
+
+    def _best_match(self, i: int, candidates: List[int], matrix) -> Optional[int]:
+        """The most similar candidate at or above the threshold, or None
+
+        Band keys can collide, so the full signatures settle it.
+        """
+        candidates = list(dict.fromkeys(candidates))  # An article can share several bands
+        if matrix is not None:
+            values = (matrix[candidates] == matrix[i]).mean(axis=1)
+            best = int(values.argmax())
+            return candidates[best] if values[best] >= self.threshold else None
+
+        signature = self.signatures[i]
+        best, best_similarity = None, self.threshold
+        for kept in candidates:
+            value = similarity(self.signatures[kept], signature)
+            if value >= best_similarity and (best is None or value > best_similarity):
+                best, best_similarity = kept, value
+        return best
+
+    def _signature_matrix(self):
+        """Signatures as an (articles, num_perm) uint32 matrix; rows without a signature are zero"""
+        matrix = np.zeros((len(self.signatures), self.hasher.num_perm), dtype=np.uint32)
+        for i, signature in enumerate(self.signatures):
+            if signature is not None:
+                matrix[i] = np.frombuffer(signature, dtype=np.uint32)
+        return matrix
+
+    def _band_keys_python(self) -> List[Optional[List[bytes]]]:
+        """Per article, the bytes of each band's slice of its signature"""
+        band_width = self.rows * self.signatures[0].itemsize if self.signatures else 0
+        band_keys = []
+        for signature in self.signatures:
+            if signature is None:
+                band_keys.append(None)
+                continue
+            data = signature.tobytes()
+            band_keys.append([data[band * band_width:(band + 1) * band_width] for band in range(self.bands)])
+        return band_keys
+
+    def _band_keys_numpy(self, matrix) -> List[Optional[List[int]]]:
+        """Per article, a polynomial hash of each band's slice of its signature"""
+        bands = matrix.reshape(len(matrix), self.bands, self.rows)
+        keys = np.zeros((len(matrix), self.bands), dtype=np.uint64)
+        for row in range(self.rows):
+            keys = keys * np.uint64(SHINGLE_BASE) + bands[:, :, row].astype(np.uint64)
+        return [row_keys if signature is not None else None
+                for signature, row_keys in zip(self.signatures, keys.tolist())]
+
+    def report(self, clusters: List[List[int]]) -> Dict:
+        duplicates = sum(len(members) - 1 for members in clusters)
+        return {
+            'articles': len(self.slugs),
+            'shingle_size': self.hasher.shingle_size,
+            'num_perm': self.hasher.num_perm,
+            'bands': self.bands,
+            'rows': self.rows,
+            'threshold': self.threshold,
+            'cluster_count': len(clusters),
+            'near_duplicates': duplicates,
+            'largest_cluster': max((len(members) for members in clusters), default=0),
+            'clusters': [
+                {
+                    'keep': self.slugs[members[0]],
+                    'size': len(members),
+                    'duplicates': [
+                        {'slug': self.slugs[i],
+                         'similarity_to_keep': round(similarity(self.signatures[members[0]], self.signatures[i]), 3)}
+                        for i in members[1:]
+                    ]
+                }
+                for members in clusters
+            ]
+        }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Find near-duplicate articles in a generated corpus')
+    parser.add_argument('--input', default=CONTENT_FILE, help='Article corpus (NDJSON)')
+    parser.add_argument('--report', default=REPORT_FILE, help='Cluster report (default: scripts/near_duplicates_report.json)')
+    parser.add_argument('--threshold', type=float, default=SIMILARITY_THRESHOLD,
+                        help=f'Estimated Jaccard similarity that counts as a near-duplicate (default: {SIMILARITY_THRESHOLD})')
+    parser.add_argument('--num-perm', type=int, default=NUM_PERM, help=f'MinHash permutations (default: {NUM_PERM})')
+    parser.add_argument('--shingle-size', type=int, default=SHINGLE_SIZE, help=f'Words per shingle (default: {SHINGLE_SIZE})')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes (default: 1)')
+    parser.add_argument('--gate-output', help='Write the corpus without near-duplicates to this path (an article '
+                                              'is blocked only if it reaches the threshold against a kept article)')
+    parser.add_argument('--fail-on-duplicates', action='store_true', help='Exit 1 if any near-duplicates are found')
+    metrics.add_metrics_argument(parser)
+    args = parser.parse_args()
+
+    metrics.enable('dedupe', args.metrics_dir)
+
+    if args.gate_output and args.input == '-':
+        raise SystemExit("❌ --gate-output re-reads the corpus, so --input must be a file")
+    if np is None:
+        print("⚠️  numpy not installed, using pure-Python signatures (slow for large corpora)", file=sys.stderr)
+
+    hasher = MinHasher(args.num_perm, args.shingle_size)
+    index = NearDuplicateIndex(hasher, args.threshold)
+    print("Fingerprinting articles...", file=sys.stderr)
+    index.add_corpus(read_records(args.input), args.workers)
+
+    clusters = index.clusters()
+    report = index.report(clusters)
+    write_text(args.report, json.dumps(report, indent=2, ensure_ascii=False))
+    METRICS.inc('near_duplicates_total', report['near_duplicates'])
+
+    print(f"✅ Fingerprinted {report['articles']} articles "
+          f"({report['bands']} bands x {report['rows']} rows, threshold {args.threshold})", file=sys.stderr)
+    print(f"   Near-duplicate clusters: {report['cluster_count']} "
+          f"(largest: {report['largest_cluster']}), near-duplicates: {report['near_duplicates']}", file=sys.stderr)
+    print(f"   Report saved to: {args.report}", file=sys.stderr)
+
+    if args.gate_output:
+        blocked = {i for members in clusters for i in members[1:]}
+        kept = (record for i, record in enumerate(read_records(args.input)) if i not in blocked)
+        count = write_records(args.gate_output, kept)
+        print(f"🚧 Gate: {count} articles passed, {len(blocked)} near-duplicates blocked -> {args.gate_output}",
+              file=sys.stderr)
+
+    sys.exit(1 if args.fail_on_duplicates and report['near_duplicates'] else 0)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Pacing for Content Generation
+Pluggable throttles that only slow the generator down when a sink needs it,
+and account for the time spent waiting
+"""
+
+import time
+
+class Pacer:
+    """Never waits; the right choice for file sinks that absorb anything"""
+
+    def __init__(self):
+        self.throttled_seconds = 0.0
+        self.throttle_events = 0
+
+    def acquire(self):
+        """Call before each unit of work"""
+
+    def report(self, saturated: bool):
+        """Backpressure signal from the downstream consumer"""
+
+    def report_latency(self, seconds: float):
+        """Report how long the last write to the sink took"""
+
+    def _sleep(self, seconds: float):
+        if seconds <= 0:
+            return
+        time.sleep(seconds)
+        self.throttled_seconds += seconds
+        self.throttle_events += 1
+
+    def summary(self) -> str:
+        return f"{self.throttled_seconds:.1f}s throttled across {self.throttle_events} waits"
+
+class TokenBucketPacer(Pacer):
+    """Allows bursts of up to `burst` units, then a sustained `rate` units per second"""
+
+    def __init__(self, rate: float, burst: int = 10):
+        super().__init__()
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+
+    def acquire(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+        if self.tokens < 1:
+            wait = (1 - self.tokens) / self.rate
+            self._sleep(wait)
+            self.tokens = 1.0
+            self.last_refill = time.monotonic()
+
+        self.tokens -= 1
+
+class BackpressurePacer(Pacer):
+    """Runs flat out until the consumer reports saturation, then backs off
+
+    The delay doubles on each saturated report (up to max_delay) and halves on
+    each clear one, dropping back to zero once the consumer has caught up.
+    Latency reports above target_latency count as saturation.
+    """
+
+    def __init__(self, target_latency: float = 0.5, min_delay: float = 0.05, max_delay: float = 5.0):
+        super().__init__()
+        self.target_latency = target_latency
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.delay = 0.0
+
+    def acquire(self):
+        self._sleep(self.delay)
+
+    def report(self, saturated: bool):
+        if saturated:
+            self.delay = min(self.max_delay, max(self.min_delay, self.delay * 2))
+        else:
+            self.delay = self.delay / 2 if self.delay > self.min_delay else 0.0
+
+    def report_latency(self, seconds: float):
+        self.report(seconds > self.target_latency)
+
+def make_pacer(spec: str) -> Pacer:
+    """Build a pacer from a CLI spec: 'none', 'rate:<per-second>[:<burst>]' or 'backpressure[:<target-latency>]'"""
+    kind, _, params = spec.partition(':')
+    if kind == 'none':
+        return Pacer()
+    if kind == 'rate':
+        rate, _, burst = params.partition(':')
+        return TokenBucketPacer(float(rate), int(burst) if burst else 10)
+    if kind == 'backpressure':
+        return BackpressurePacer(float(params)) if params else BackpressurePacer()
+    raise ValueError(f"Unknown pacing spec: {spec}")
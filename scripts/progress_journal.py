@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Append-Only Progress Journal for Blog Post Generation
+Records one line per processed article instead of rewriting a progress file,
+keeps an in-memory set of completed slugs, and compacts itself periodically
+"""
+
+import json
+import os
+from typing import Optional
+
+class ProgressJournal:
+    """Checkpoint store: O(1) appends and lookups, amortized O(1) compaction
+
+    The journal is a JSON-lines file. The first line may be a snapshot of the
+    full state; every following line is one processed article:
+
+        {"snapshot": {"completed": [...], "current_index": 12, "total_published": 11}}
+        {"slug": "...", "index": 12, "published": true}
+
+    A torn final line from a crash is ignored on replay.
+    """
+
+    def __init__(self, path: str, legacy_path: Optional[str] = None, compact_every: int = 1000):
+        self.path = path
+        self.compact_every = compact_every
+        self.completed = set()
+        self.current_index = 0
+        self.total_published = 0
+        self.events_since_compaction = 0
+        self.file = None
+
+        if os.path.exists(path):
+            self._replay()
+        elif legacy_path and os.path.exists(legacy_path):
+            self._import_legacy(legacy_path)
+            self.compact()
+
+        if self.file is None:
+            self.file = open(path, 'a', encoding='utf-8')
+
+    def _replay(self):
+        good_offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # Torn write at the end of the journal
+                good_offset += len(line)
+                if 'snapshot' in entry:
+                    snapshot = entry['snapshot']
+                    self.completed = set(snapshot['completed'])
+                    self.current_index = snapshot['current_index']
+                    self.total_published = snapshot['total_published']
+                else:
+                    self._apply(entry['slug'], entry['index'], entry['published'])
+                    self.events_since_compaction += 1
+
+        # Drop a torn tail so new entries start on a clean line
+        if good_offset < os.path.getsize(self.path):
+            os.truncate(self.path, good_offset)
+
+    def _import_legacy(self, legacy_path: str):
+        """Seed the journal from the old blog_generation_progress.json format"""
+        with open(legacy_path, 'r') as f:
+            progress = json.load(f)
+        self.completed = set(progress.get('completed', []))
+        self.current_index = progress.get('current_index', 0)
+        self.total_published = progress.get('total_published', 0)
+
+    def _apply(self, slug: str, index: int, published: bool):
+        if published and slug not in self.completed:
+            self.completed.add(slug)
+            self.total_published += 1
+        self.current_index = index + 1
+
+    def record(self, slug: str, index: int, published: bool):
+        """Append one processed article to the journal"""
+        self._apply(slug, index, published)
+        self.file.write(json.dumps({'slug': slug, 'index': index, 'published': published}) + '\n')
+        self.file.flush()
+
+        # Compact once the tail outgrows the snapshot, so rewrites stay amortized O(1)
+        self.events_since_compaction += 1
+        if self.events_since_compaction >= max(self.compact_every, len(self.completed)):
+            self.compact()
+
+    def compact(self):
+        """Atomically replace the journal with a single snapshot line"""
+        snapshot = {
+            'completed': sorted(self.completed),
+            'current_index': self.current_index,
+            'total_published': self.total_published
+        }
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'snapshot': snapshot}) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+        if self.file:
+            self.file.close()
+        os.replace(tmp_path, self.path)
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.events_since_compaction = 0
+
+    def close(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
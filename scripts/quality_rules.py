@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Rule-Based Quality Scoring for Articles
+Declarative quality rules compiled into a minimal set of early-exit probes,
+so adding a rule doesn't add a full pass over every article
+"""
+
+import argparse
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from corpus_io import CONTENT_FILE, CORPUS_NEWLINE, read_records
+
+# Each rule deducts its penalty when it fails. Kinds:
+#   any_of:      passes if any keyword occurs (case-insensitive substring)
+#   min_length:  passes if the body has at least this many characters
+#   line_prefix: passes if at least min_count lines start with the prefix
+QUALITY_RULES = [
+    {'name': 'too_short', 'penalty': 20, 'min_length': 400},
+    {'name': 'not_engaging', 'penalty': 15, 'any_of': ['you', 'your', "you're", "you've"]},
+    {'name': 'not_conversational', 'penalty': 10, 'any_of': ['?', '!']},
+    {'name': 'not_actionable', 'penalty': 10, 'any_of': ['how', 'why']},
+    {'name': 'poor_structure', 'penalty': 10, 'line_prefix': '#', 'min_count': 3}
+]
+
+BASE_SCORE = 100
+PUBLISH_THRESHOLD = 80
+
+class QualityResult:
+    __slots__ = ('score', 'failed')
+
+    def __init__(self, score: int, failed: Tuple[str, ...]):
+        self.score = score
+        self.failed = failed
+
+    def __repr__(self):
+        return f'QualityResult(score={self.score}, failed={self.failed})'
+
+class QualityEngine:
+    """Scores article bodies against a compiled rule set
+
+    Rules compile to a short list of substring probes over one lowercased
+    copy of the body. A keyword that contains another keyword of the same
+    rule is dropped ("your" can't occur without "you"), and a probe hit also
+    passes every other rule whose keyword it contains. Probes stop at the
+    first hit, and line_prefix rules stop once min_count is reached.
+    """
+
+    def __init__(self, rules: List[Dict] = QUALITY_RULES, base_score: int = BASE_SCORE, newline: str = '\n'):
+        self.rules = rules
+        self.base_score = base_score
+        self.newline = newline
+        self.length_rules = []  # (rule index, min length)
+        self.prefix_rules = []  # (rule index, newline + prefix, prefix, min count)
+        self.probes = []        # (rule index, keyword, probe raw text?, rule indexes a hit passes)
+
+        keywords = {}  # lowercased keyword -> rule indexes
+        for i, rule in enumerate(rules):
+            if 'min_length' in rule:
+                self.length_rules.append((i, rule['min_length']))
+            elif 'line_prefix' in rule:
+                self.prefix_rules.append((i, newline + rule['line_prefix'], rule['line_prefix'], rule['min_count']))
+            elif 'any_of' in rule:
+                for keyword in rule['any_of']:
+                    keywords.setdefault(keyword.lower(), set()).add(i)
+            else:
+                raise ValueError(f"Rule {rule.get('name')!r} has no recognised kind")
+
+        for i, rule in enumerate(rules):
+            if 'any_of' not in rule:
+                continue
+            rule_keywords = {keyword.lower() for keyword in rule['any_of']}
+            for keyword in sorted(rule_keywords, key=len):
+                if any(other != keyword and other in keyword for other in rule_keywords):
+                    continue  # Implied by a shorter keyword of the same rule
+                passes = frozenset(
+                    rule_index
+                    for other, rule_indexes in keywords.items() if other in keyword
+                    for rule_index in rule_indexes
+                )
+                # Keywords without letters can be probed without lowercasing the body
+                self.probes.append((i, keyword, keyword == keyword.upper(), passes))
+
+        self.needs_lower = any(not raw for _, _, raw, _ in self.probes)
+
+    def score(self, text: str) -> QualityResult:
+        failed = set()
+        for i, min_length in self.length_rules:
+            if len(text) < min_length:
+                failed.add(i)
+
+        for i, marker, prefix, min_count in self.prefix_rules:
+            found = 1 if text.startswith(prefix) else 0
+            position = text.find(marker)
+            while position >= 0 and found < min_count:
+                found += 1
+                position = text.find(marker, position + len(marker))
+            if found < min_count:
+                failed.add(i)
+
+        lower = text.lower() if self.needs_lower else text
+        passed = set()
+        undecided = set()
+        for i, keyword, raw, passes in self.probes:
+            if i in passed:
+                continue
+            if keyword in (text if raw else lower):
+                passed.update(passes)
+            else:
+                undecided.add(i)
+        failed.update(undecided - passed)
+
+        score = self.base_score
+        for i in sorted(failed):
+            score -= self.rules[i]['penalty']
+        return QualityResult(score, tuple(self.rules[i]['name'] for i in sorted(failed)))
+
+    def score_batch(self, texts: Iterable[str]) -> Tuple[List[QualityResult], Dict[str, int]]:
+        """Score many bodies; returns the results and failures per rule"""
+        results = [self.score(text) for text in texts]
+        breakdown = {rule['name']: 0 for rule in self.rules}
+        for result in results:
+            for name in result.failed:
+                breakdown[name] += 1
+        return results, breakdown
+
+def gate_corpus(input_file: str, threshold: int = PUBLISH_THRESHOLD, batch_size: int = 1000,
+                engine: Optional[QualityEngine] = None) -> Tuple[int, int, Dict[str, int]]:
+    """Score a generated corpus in batches; returns (passed, total, failures per rule)"""
+    engine = engine or QualityEngine(newline=CORPUS_NEWLINE)
+    passed = total = 0
+    breakdown = {rule['name']: 0 for rule in engine.rules}
+
+    batch = []
+    records = read_records(input_file)
+    while True:
+        batch.clear()
+        for record in records:
+            batch.append(record.get('content', ''))
+            if len(batch) >= batch_size:
+                break
+        if not batch:
+            break
+        results, batch_breakdown = engine.score_batch(batch)
+        total += len(results)
+        passed += sum(1 for result in results if result.score >= threshold)
+        for name, count in batch_breakdown.items():
+            breakdown[name] += count
+
+    return passed, total, breakdown
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Quality-gate a generated article corpus')
+    parser.add_argument('--input', default=CONTENT_FILE, help="Article corpus (NDJSON), or '-' for stdin")
+    parser.add_argument('--threshold', type=int, default=PUBLISH_THRESHOLD,
+                        help=f'Minimum score to pass (default: {PUBLISH_THRESHOLD})')
+    args = parser.parse_args()
+
+    passed, total, breakdown = gate_corpus(args.input, args.threshold)
+
+    print(f"✅ {passed}/{total} articles scored {args.threshold}+")
+    print("\n📋 Failures by rule:")
+    for rule in QUALITY_RULES:
+        print(f"   {rule['name']} (-{rule['penalty']}): {breakdown[rule['name']]}")
+
+    sys.exit(0 if passed == total else 1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Slug Service for All Article Generators
+One slug rule for every generator, a persistent index of issued slugs with
+deterministic collision suffixes (-2, -3, ...), and a bulk API that slugifies
+and dedupes large title lists before any SQL is generated
+"""
+
+import os
+import re
+from typing import Iterable, List, Optional
+
+from corpus_io import SCRIPTS_DIR
+
+# Shared by every generator, since they all load into the same blog_posts table
+SLUG_INDEX_FILE = os.path.join(SCRIPTS_DIR, 'slug_index.tsv')
+
+NON_SLUG_CHARS = re.compile(r'[^a-z0-9\s-]')
+WHITESPACE = re.compile(r'\s+')
+DASHES = re.compile(r'-+')
+
+# Bulk variant: whitespace becomes '-' and disallowed characters are deleted
+# in one translate(), leaving only dash runs to collapse
+ALLOWED_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789-\n')
+ASCII_SEPARATORS = bytes(i for i in range(128) if chr(i).isspace() and chr(i) != '\n')
+ASCII_TABLE = bytes.maketrans(ASCII_SEPARATORS, b'-' * len(ASCII_SEPARATORS))
+ASCII_DELETE = bytes(i for i in range(256) if chr(i) not in ALLOWED_CHARS and i not in ASCII_SEPARATORS)
+DASH_RUNS = re.compile(r'--+')
+NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+def slugify(title: str, max_length: Optional[int] = None) -> str:
+    """URL-friendly ASCII slug: lowercase, [a-z0-9-] only, single dashes, no edge dashes"""
+    slug = NON_SLUG_CHARS.sub('', title.lower())
+    slug = WHITESPACE.sub('-', slug)
+    slug = DASHES.sub('-', slug).strip('-')
+    return slug[:max_length] if max_length else slug
+
+def slugify_bulk(titles: List[str], max_length: Optional[int] = None) -> List[str]:
+    """slugify() for a whole list at once
+
+    The titles are joined into one newline-separated blob; a single
+    translate() over the blob maps whitespace to '-' and drops disallowed
+    characters (a bytes translate, after non-ASCII characters are mapped out), and one regex pass
+    collapses dash runs, instead of three regex calls per title.
+    """
+    if not titles:
+        return []
+    if any('\n' in title for title in titles):
+        return [slugify(title, max_length) for title in titles]
+
+    blob = '\n'.join(titles).lower()
+    if not blob.isascii():
+        # Never slug characters: whitespace -> '-', the rest dropped
+        blob = NON_ASCII.sub(lambda match: '-' if match.group().isspace() else '', blob)
+    blob = blob.encode('ascii').translate(ASCII_TABLE, ASCII_DELETE).decode('ascii')
+    blob = DASH_RUNS.sub('-', blob)
+
+    if max_length:
+        return [slug.strip('-')[:max_length] for slug in blob.split('\n')]
+    return [slug.strip('-') for slug in blob.split('\n')]
+
+class SlugIndex:
+    """Issued slugs and the article that owns each one
+
+    An owner (e.g. the source title) always gets back the slug it was issued
+    first; a different owner asking for a taken slug gets the first free
+    -2, -3, ... variant. With a path, the index is a tab-separated file that
+    new issues are appended to, so suffixes stay stable across runs.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.owners = {}    # slug -> owner
+        self.issued = {}    # owner -> slug
+        self.pending = []   # (slug, owner) not yet written
+        self.next_suffix = {}  # base -> next suffix to try, so repeated collisions stay O(1)
+        self.collisions = 0
+
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    slug, _, owner = line.rstrip('\n').partition('\t')
+                    if slug:
+                        self.owners.setdefault(slug, owner)
+                        self.issued.setdefault(owner, slug)
+
+    def issue(self, base: str, owner: str, max_length: Optional[int] = None) -> str:
+        """Return the slug for owner, deriving it from base on first issue"""
+        owner = owner.replace('\t', ' ').replace('\n', ' ')
+        slug = self.issued.get(owner)
+        if slug is not None:
+            return slug
+
+        base = base or 'article'
+        slug = base
+        if slug in self.owners:
+            self.collisions += 1
+            n = self.next_suffix.get(base, 2)
+            while True:
+                suffix = f'-{n}'
+                slug = (base[:max_length - len(suffix)].rstrip('-') if max_length else base) + suffix
+                if slug not in self.owners:
+                    break
+                n += 1
+            self.next_suffix[base] = n + 1
+
+        self.owners[slug] = owner
+        self.issued[owner] = slug
+        self.pending.append((slug, owner))
+        return slug
+
+    def issue_bulk(self, titles: List[str], owners: Optional[Iterable[str]] = None,
+                   max_length: Optional[int] = None) -> List[str]:
+        """Slugify and dedupe a list of titles; owners default to the titles"""
+        bases = slugify_bulk(titles, max_length)
+        owners = titles if owners is None else owners
+        return [self.issue(base, owner, max_length) for base, owner in zip(bases, owners)]
+
+    def save(self):
+        """Append newly issued slugs to the index file"""
+        if not self.path or not self.pending:
+            self.pending = []
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(f'{slug}\t{owner}\n' for slug, owner in self.pending)
+        self.pending = []
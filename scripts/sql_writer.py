@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Streaming SQL Writer for the Blog SQL Emitters
+SQL generators yield statements straight into a buffered, optionally
+compressed file, so a batch is never held in memory as one string:
+
+    write_sql('batch_01_blog_articles.sql', generate_batch_file(batch, 1), 'gzip')
+    -> batch_01_blog_articles.sql.gz
+
+Output goes to a temp file that replaces the target on close, so a reader
+never sees a half-written batch, and any other variant of the same file
+(plain or differently compressed) is removed. blog_loader.py loads .sql.gz / .sql.zst
+files by piping them through the matching decompressor into psql.
+"""
+
+import gzip
+import os
+import time
+from typing import Iterable, Optional
+
+from metrics import METRICS
+
+try:
+    import zstandard
+except ImportError:  # zstd output needs `pip install zstandard`; gzip always works
+    zstandard = None
+
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+# Shell decompressors for the loader, by file suffix
+DECOMPRESSORS = {'.gz': ['gzip', '-dc'], '.zst': ['zstd', '-dc']}
+
+WRITE_BUFFER_BYTES = 1 << 20
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+def compressed_path(path: str, compression: Optional[str]) -> str:
+    """Output path for a compression setting (None or 'none' for plain text)"""
+    return path + COMPRESSION_SUFFIXES.get(compression, '')
+
+class SqlWriter:
+    """Buffered text writer for one SQL file, compressing as it streams"""
+
+    def __init__(self, path: str, compression: Optional[str] = None):
+        if compression == 'zstd' and zstandard is None:
+            raise RuntimeError("zstd output needs the zstandard package (pip install zstandard)")
+
+        self.base_path = path
+        self.path = compressed_path(path, compression)
+        self.tmp_path = f'{self.path}.tmp'
+        self.bytes_in = 0
+        self.seconds = 0.0
+
+        self.raw = open(self.tmp_path, 'wb', buffering=WRITE_BUFFER_BYTES)
+        if compression == 'gzip':
+            # mtime=0: no timestamp in the gzip header, so identical SQL compresses identically
+            self.stream = gzip.GzipFile(fileobj=self.raw, mode='wb', compresslevel=GZIP_LEVEL, mtime=0)
+        elif compression == 'zstd':
+            self.stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(self.raw, closefd=False)
+        else:
+            self.stream = self.raw
+
+    def write(self, text: str):
+        start = time.perf_counter()
+        data = text.encode('utf-8')
+        self.stream.write(data)
+        self.bytes_in += len(data)
+        self.seconds += time.perf_counter() - start
+
+    def write_all(self, chunks: Iterable[str]):
+        for chunk in chunks:
+            self.write(chunk)
+
+    def close(self) -> int:
+        """Finish the file and move it into place; returns bytes on disk"""
+        start = time.perf_counter()
+        if self.stream is not self.raw:
+            self.stream.close()
+        self.raw.close()
+        os.replace(self.tmp_path, self.path)
+        self.seconds += time.perf_counter() - start
+
+        # One variant per file: a stale plain or differently compressed copy
+        # would be loaded as well
+        for suffix in [''] + list(COMPRESSION_SUFFIXES.values()):
+            if self.base_path + suffix != self.path and os.path.exists(self.base_path + suffix):
+                os.remove(self.base_path + suffix)
+
+        written = os.path.getsize(self.path)
+        METRICS.observe('file_write_seconds', self.seconds)
+        METRICS.inc('files_written_total')
+        METRICS.inc('bytes_emitted_total', written)
+        METRICS.inc('sql_bytes_uncompressed_total', self.bytes_in)
+        return written
+
+    def abort(self):
+        """Drop a partially written file"""
+        if self.stream is not self.raw:
+            self.stream.close()
+        self.raw.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+
+def write_sql(path: str, chunks: Iterable[str], compression: Optional[str] = None) -> int:
+    """Stream chunks of SQL into path (plus the compression suffix); returns bytes on disk"""
+    with SqlWriter(path, compression) as writer:
+        writer.write_all(chunks)
+        return writer.close()
+
+def add_compression_argument(parser):
+    choices = ['none', 'gzip'] + (['zstd'] if zstandard is not None else [])
+    parser.add_argument('--compress', choices=choices, default='none',
+                        help='Compress batch files as they are written: .sql.gz or .sql.zst '
+                             '(zstd needs the zstandard package; default: none)')
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Persistent Index of the Blog Post TOC
+Parses blog-posts-toc.md into sections, categories, numbered titles and
+slugs with precompiled patterns, persists the result, and on later runs
+re-parses only the regions of the file that changed
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Bump when parsing or slug rules change, so persisted indexes are rebuilt
+INDEX_VERSION = 2
+
+# Section heading markers -> audience slug
+SECTION_MARKERS = (
+    ('## Section 1: Young Learners', 'young-learners'),
+    ('## Section 2: Teenagers', 'teenagers'),
+    ('## Section 3: Professionals', 'professionals'),
+    ('## Section 4: SMEs', 'business-owners')
+)
+
+ARTICLE_PATTERN = re.compile(r'^(\d+)\.\s+\*\*(.*?)\*\*.*?$')
+SUBTITLE_PATTERN = re.compile(r'(.*?):\s+(.*)')
+
+def split_regions(text: str) -> List[str]:
+    """Split the TOC at section/category headings; each region starts with its heading
+
+    Parser state (audience, category) only changes on heading lines, so a
+    region parses the same way whenever its text and incoming state match.
+    """
+    regions = []
+    current = []
+    for line in text.split('\n'):
+        if current and (line.startswith('### ') or '## Section ' in line):
+            regions.append('\n'.join(current))
+            current = []
+        current.append(line)
+    if current:
+        regions.append('\n'.join(current))
+    return regions
+
+def parse_region(region: str, audience: Optional[str], category: Optional[str],
+                 slugify: Callable[[str], str]) -> Tuple[List[Dict], Optional[str], Optional[str]]:
+    """Parse one region; returns (articles, audience, category) after the region"""
+    articles = []
+    for line in region.split('\n'):
+        if '## Section ' in line:
+            for marker, section_audience in SECTION_MARKERS:
+                if marker in line:
+                    audience = section_audience
+                    break
+
+        if line.startswith('### '):
+            category = line.replace('###', '').strip()
+
+        if not line[:1].isdigit():
+            continue
+        match = ARTICLE_PATTERN.match(line)
+        if not match:
+            continue
+
+        title = match.group(2).strip()
+        subtitle_match = SUBTITLE_PATTERN.match(title)
+        if subtitle_match:
+            main_title, subtitle = subtitle_match.group(1), subtitle_match.group(2)
+        else:
+            main_title, subtitle = title, None
+
+        articles.append({
+            'number': int(match.group(1)),
+            'title': title,
+            'main_title': main_title,
+            'subtitle': subtitle,
+            'audience': audience,
+            'category': category,
+            'slug': slugify(title)
+        })
+    return articles, audience, category
+
+class TocIndex:
+    """TOC articles backed by an on-disk index
+
+    Warm runs with an unchanged file (same mtime and size, or same content
+    hash) load the index without parsing. When the file changed, regions
+    whose text and incoming state are already indexed are reused and only
+    the rest are parsed.
+    """
+
+    def __init__(self, toc_path: str, index_path: str, slugify: Callable[[str], str]):
+        self.toc_path = toc_path
+        self.index_path = index_path
+        self.slugify = slugify
+        self.articles: List[Dict] = []
+        self.regions_reused = 0
+        self.regions_parsed = 0
+        self.warm = False
+
+    def _load_index(self) -> Optional[Dict]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return index if index.get('version') == INDEX_VERSION else None
+
+    def _save_index(self, index: Dict):
+        tmp_path = f'{self.index_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def load(self) -> List[Dict]:
+        stat = os.stat(self.toc_path)
+        index = self._load_index()
+
+        if index and index['mtime_ns'] == stat.st_mtime_ns and index['size'] == stat.st_size:
+            return self._use(index, warm=True)
+
+        with open(self.toc_path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+
+        if index and index['sha256'] == digest:
+            # Touched but unchanged: refresh the stat key only
+            index['mtime_ns'], index['size'] = stat.st_mtime_ns, stat.st_size
+            self._save_index(index)
+            return self._use(index, warm=True)
+
+        known = {}
+        for region in (index or {}).get('regions', []):
+            known[(region['hash'], region['audience_in'], region['category_in'])] = region
+
+        regions = []
+        audience = category = None
+        for text in split_regions(data.decode('utf-8')):
+            region_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+            cached = known.get((region_hash, audience, category))
+            if cached:
+                self.regions_reused += 1
+                region = cached
+            else:
+                self.regions_parsed += 1
+                articles, audience_out, category_out = parse_region(text, audience, category, self.slugify)
+                region = {
+                    'hash': region_hash,
+                    'audience_in': audience,
+                    'category_in': category,
+                    'audience_out': audience_out,
+                    'category_out': category_out,
+                    'articles': articles
+                }
+            regions.append(region)
+            audience, category = region['audience_out'], region['category_out']
+
+        index = {
+            'version': INDEX_VERSION,
+            'source': os.path.abspath(self.toc_path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': digest,
+            'regions': regions
+        }
+        self._save_index(index)
+        return self._use(index, warm=False)
+
+    def _use(self, index: Dict, warm: bool) -> List[Dict]:
+        self.warm = warm
+        self.articles = [article for region in index['regions'] for article in region['articles']]
+        return self.articles
+
+    def sections(self) -> Dict[str, List[str]]:
+        """Audience -> its categories, in TOC order"""
+        sections = {}
+        for article in self.articles:
+            categories = sections.setdefault(article['audience'], [])
+            if article['category'] not in categories:
+                categories.append(article['category'])
+        return sections
+
+    def summary(self) -> str:
+        if self.warm:
+            return "index up to date"
+        return f"{self.regions_parsed} regions parsed, {self.regions_reused} reused"
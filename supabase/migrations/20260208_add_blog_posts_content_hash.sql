@@ -0,0 +1,19 @@
+-- Content hash for blog_posts, used by the staging merge load
+-- (scripts/generate_sql_scripts.py --format merge). A re-published post is
+-- only rewritten when its hash changes, so unchanged posts cost nothing.
+ALTER TABLE blog_posts
+  ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+COMMENT ON COLUMN blog_posts.content_hash IS
+  'sha256 of the generated content fields (see blog_post_content_hash in scripts/generate_sql_scripts.py)';
+
+-- Backfill with the same definition the generator uses: the fields joined
+-- with a unit separator (NULLs skipped), category by slug
+UPDATE blog_posts p
+SET content_hash = encode(sha256(convert_to(concat_ws(E'\x1f',
+    p.title, p.slug, p.content, p.excerpt,
+    (SELECT c.slug FROM blog_categories c WHERE c.id = p.category_id),
+    p.meta_title, p.meta_description, p.seo_keywords,
+    p.og_title, p.og_description, p.featured_image
+  ), 'UTF8')), 'hex')
+WHERE p.content_hash IS NULL;